@@ -2,6 +2,7 @@
 # Subscribe YouTube Channel For Amazing Bot @Tech_VJ
 # Ask Doubt on telegram @KingVJ01
 
+import asyncio
 from pyrogram import Client, types
 from info import *
 from helper import temp
@@ -30,6 +31,7 @@ class TechVJXBot(Client):
         chat_id: Union[int, str],
         limit: int,
         offset: int = 0,
+        prefetch: int = 2,
     ) -> Optional[AsyncGenerator["types.Message", None]]:
         """Iterate through a chat sequentially.
         This convenience method does the same as repeatedly calling :meth:`~pyrogram.Client.get_messages` in a loop, thus saving
@@ -47,6 +49,11 @@ class TechVJXBot(Client):
             offset (``int``, *optional*):
                 Identifier of the first message to be returned.
                 Defaults to 0.
+
+            prefetch (``int``, *optional*):
+                Batches of messages fetched ahead in the background while the caller
+                works on the current one, so fetching and processing overlap.
+                Defaults to 2.
         Returns:
             ``Generator``: A generator yielding :obj:`~pyrogram.types.Message` objects.
         Example:
@@ -54,15 +61,36 @@ class TechVJXBot(Client):
                 for message in app.iter_messages("pyrogram", 1, 15000):
                     print(message.text)
         """
-        current = offset
-        while True:
-            new_diff = min(200, limit - current)
-            if new_diff <= 0:
+        batches = asyncio.Queue(maxsize=max(prefetch, 1))
+
+        async def fetch():
+            current = offset
+            try:
+                while True:
+                    new_diff = min(200, limit - current)
+                    if new_diff <= 0:
+                        break
+                    messages = await self.get_messages(chat_id, list(range(current, current+new_diff+1)))
+                    await batches.put(messages)
+                    current += new_diff + 1
+            except Exception as e:
+                # raised again on the consumer side
+                await batches.put(e)
                 return
-            messages = await self.get_messages(chat_id, list(range(current, current+new_diff+1)))
-            for message in messages:
-                yield message
-                current += 1
+            await batches.put(None)
+
+        fetcher = asyncio.create_task(fetch())
+        try:
+            while True:
+                messages = await batches.get()
+                if messages is None:
+                    return
+                if isinstance(messages, Exception):
+                    raise messages
+                for message in messages:
+                    yield message
+        finally:
+            fetcher.cancel()
       
 TechVJBot = TechVJXBot()
 
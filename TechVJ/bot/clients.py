@@ -4,8 +4,11 @@
 
 import asyncio
 import logging
+import math
+from collections import deque
 from info import *
 from pyrogram import Client
+from pyrogram.errors import FloodWait
 from TechVJ.util.config_parser import TokenParser
 from TechVJ.bot import multi_clients, work_loads, TechVJBot
 
@@ -46,3 +49,124 @@ async def initialize_clients():
     else:
         print("No additional clients were initialized, using default client")
 
+
+async def iter_messages_parallel(chat_id, limit, offset=0):
+    """Like TechVJBot.iter_messages, but fetching with every started client at once.
+
+    The message ids are cut into chunks of 200 and each client gets one
+    contiguous run of chunks. A client that finished its run, or is waiting
+    out a FloodWait, has its chunks stolen from the far end of the longest
+    remaining run, so no client idles while work is left. Clients that can
+    not read the chat (not a member, unknown peer) drop out and leave their
+    chunks to the others. Messages do not come in order.
+
+    File ids only work for the bot that received them, so the extra clients
+    only find which ids hold media; those ids are collected into full calls
+    of 200 and fetched again with TechVJBot, and only its copies are yielded.
+    On a channel of files nearly every message is fetched by TechVJBot this
+    way, so its rate limit stays the limit and extra clients mostly save it
+    the empty and service messages.
+    """
+    if len(multi_clients) < 2:
+        async for message in TechVJBot.iter_messages(chat_id, limit, offset):
+            yield message
+        return
+    if offset >= limit:
+        return
+    ids = range(offset, limit + 1)
+    chunks = [ids[start:start + 200] for start in range(0, len(ids), 200)]
+    share = math.ceil(len(chunks) / len(multi_clients))
+    runs = {key: deque(chunks[n * share:(n + 1) * share]) for n, key in enumerate(multi_clients)}
+    # bounded, so fetching pauses while the caller is busy saving
+    results = asyncio.Queue(maxsize=2 * len(multi_clients))
+    # media ids found by the extra clients, a None per client once it is done
+    found = asyncio.Queue()
+    helpers = sum(1 for client in multi_clients.values() if client is not TechVJBot)
+
+    def take(key):
+        if runs[key]:
+            return runs[key].popleft()
+        longest = max(runs, key=lambda other: len(runs[other]))
+        return runs[longest].pop() if runs[longest] else None
+
+    async def fetch(key, client):
+        error = None
+        while True:
+            chunk = take(key)
+            if chunk is None:
+                break
+            work_loads[key] += 1
+            try:
+                messages = await client.get_messages(chat_id, list(chunk))
+                if client is not TechVJBot:
+                    # a helper's copy of a media message is never yielded
+                    found.put_nowait([message.id for message in messages if not message.empty and message.media])
+                    messages = [message for message in messages if message.empty or not message.media]
+            except FloodWait as e:
+                # the others can steal the chunk while this client waits
+                runs[key].appendleft(chunk)
+                logging.warning(f"Client {key} got FloodWait of {e.value}s while indexing.")
+                await asyncio.sleep(e.value)
+                continue
+            except Exception as e:
+                runs[key].appendleft(chunk)
+                logging.warning(f"Client {key} can not read {chat_id}, leaving its messages to the other clients: {e}")
+                error = e
+                break
+            finally:
+                work_loads[key] -= 1
+            await results.put(messages)
+        if client is not TechVJBot:
+            found.put_nowait(None)
+        # tells the reader this client is done
+        await results.put((key, error))
+
+    async def fetch_media():
+        ids, done, error = [], 0, None
+        while ids or done < helpers:
+            while len(ids) < 200 and done < helpers:
+                item = await found.get()
+                if item is None:
+                    done += 1
+                else:
+                    ids.extend(item)
+            batch, ids = ids[:200], ids[200:]
+            if not batch:
+                continue
+            try:
+                messages = await TechVJBot.get_messages(chat_id, batch)
+            except FloodWait as e:
+                # only TechVJBot waits here, the extra clients keep fetching
+                ids[:0] = batch
+                logging.warning(f"Client 0 got FloodWait of {e.value}s while fetching media found by the other clients.")
+                await asyncio.sleep(e.value)
+                continue
+            except Exception as e:
+                logging.warning(f"Client 0 can not fetch media found by the other clients in {chat_id}: {e}")
+                error = e
+                break
+            await results.put([message for message in messages if not message.empty])
+        await results.put(('media', error))
+
+    tasks = [asyncio.create_task(fetch(key, client)) for key, client in multi_clients.items()]
+    tasks.append(asyncio.create_task(fetch_media()))
+    running = len(tasks)
+    error = None
+    try:
+        while running:
+            item = await results.get()
+            if isinstance(item, tuple):
+                running -= 1
+                if item[0] == 'media' and item[1]:
+                    raise item[1]
+                error = item[1] or error
+                continue
+            for message in item:
+                yield message
+        if any(runs.values()):
+            # every client dropped out with chunks left
+            raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
@@ -16,6 +16,9 @@ logging.getLogger("cinemagoer").setLevel(logging.ERROR)
 
 from pyrogram import Client, idle
 from database.users_chats_db import db
+from database.ia_filterdb import build_file_index, backfill_file_tokens, build_spell_dictionary
+from database.rebalancer import rebalancer
+from database.hot_queries import hot_queries
 from info import *
 from helper import temp
 from typing import Union, Optional, AsyncGenerator
@@ -40,6 +43,11 @@ async def start():
     print('Initalizing Your Bot')
     bot_info = await TechVJBot.get_me()
     await initialize_clients()
+    asyncio.create_task(build_file_index())
+    asyncio.create_task(backfill_file_tokens())
+    asyncio.create_task(build_spell_dictionary())
+    asyncio.create_task(rebalancer.resume(TechVJBot))
+    asyncio.create_task(hot_queries.warm())
     for name in files:
         with open(name) as a:
             patt = Path(a.name)
@@ -0,0 +1,66 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+from bisect import bisect_left
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over normalized titles, for search-as-you-type.
+
+    Every title is stored once per word it contains, as the text from that
+    word to the end ("dark knight" for "the dark knight"), so typing any
+    word of a title finds it. keys stays sorted and title_ids runs parallel
+    to it, so a prefix is one bisect plus a short scan.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.title_ids = []
+        self.titles = []
+        self.known = set()
+
+    def __len__(self):
+        return len(self.titles)
+
+    @staticmethod
+    def _suffixes(title):
+        words = title.split()
+        return [' '.join(words[i:]) for i in range(len(words))]
+
+    def add(self, title):
+        """Index a new distinct title."""
+        if not title or title in self.known:
+            return
+        self.known.add(title)
+        title_id = len(self.titles)
+        self.titles.append(title)
+        for key in self._suffixes(title):
+            i = bisect_left(self.keys, key)
+            self.keys.insert(i, key)
+            self.title_ids.insert(i, title_id)
+
+    def load(self, titles):
+        """Replace the index with the given distinct titles in one sort."""
+        self.titles = list(dict.fromkeys(title for title in titles if title))
+        self.known = set(self.titles)
+        pairs = sorted((key, title_id) for title_id, title in enumerate(self.titles) for key in self._suffixes(title))
+        self.keys = [key for key, _ in pairs]
+        self.title_ids = [title_id for _, title_id in pairs]
+
+    def complete(self, prefix, limit=10, scan=200):
+        """Up to limit titles having a word sequence that starts with prefix, titles starting with it first."""
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix:
+            return []
+        start = bisect_left(self.keys, prefix)
+        leading, inner = [], []
+        for key, title_id in zip(self.keys[start:start + scan], self.title_ids[start:start + scan]):
+            if not key.startswith(prefix):
+                break
+            title = self.titles[title_id]
+            (leading if title == key else inner).append(title)
+        return list(dict.fromkeys(leading + inner))[:limit]
+
+
+title_prefixes = PrefixIndex()
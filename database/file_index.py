@@ -0,0 +1,349 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import re, math, heapq, asyncio, logging
+from array import array
+from bisect import bisect_left, insort
+from collections import Counter
+from info import SEARCH_MODE
+from database.file_metadata import parse_file_name, field_keys
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+YEAR_RE = re.compile(r"^(19|20)\d\d$")
+
+# BM25 parameters and the boosts added on top for relevance ranking
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_BOOST = 3.0
+YEAR_BOOST = 1.5
+
+
+def tokenize(text):
+    """Split a file name or query into lowercase word tokens."""
+    return TOKEN_RE.findall(str(text).lower())
+
+
+def trigrams(text):
+    """Character trigrams of every token, padded so word starts and ends count too."""
+    grams = set()
+    for token in tokenize(text):
+        padded = f" {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _contains(posting, doc_id):
+    i = bisect_left(posting, doc_id)
+    return i < len(posting) and posting[i] == doc_id
+
+
+class FileIndex:
+    """In-memory inverted index of file_name tokens.
+
+    Every indexed file gets a small integer doc id in insertion order, so
+    posting lists stay sorted just by appending and "newest first" is simply
+    descending doc id. Deleted files are tombstoned and skipped on lookup.
+
+    With trigrams=True a second set of posting lists over character
+    trigrams is kept for substring and typo tolerant lookups. With
+    names=True the cleaned names are kept too, for relevance boosts.
+    Metadata parsed from the name (year, season, resolution, ...) gets its
+    own posting lists keyed "field:value", so menu filters are intersections.
+    """
+
+    def __init__(self, trigrams=False, names=False):
+        self.trigrams = trigrams
+        self.keep_names = names
+        self.ready = False
+        self._pending = []
+        self._reset()
+
+    def _reset(self):
+        self.postings = {}       # token -> array of doc ids
+        self.vocab = []          # sorted tokens, for prefix lookups
+        self.file_ids = []       # doc id -> file_id
+        self.shards = array('B') # doc id -> index of the collection holding the file
+        self.doc_ids = {}        # file_id -> doc id
+        self.deleted = set()
+        self.grams = {}          # trigram -> array of doc ids
+        self.gram_counts = array('H') # doc id -> number of trigrams in its name
+        self.lengths = array('H')     # doc id -> number of tokens in its name
+        self.total_length = 0
+        self.names = []               # doc id -> cleaned file name, only with names=True
+        self.fields = {}              # "field:value" -> array of doc ids
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def clear(self):
+        """Forget every file, e.g. after the file collections were dropped."""
+        self._reset()
+        self._pending = []
+
+    def _add(self, file_id, file_name, shard, sort_vocab=True):
+        if file_id in self.doc_ids:
+            # the file was moved to another collection
+            self.shards[self.doc_ids[file_id]] = shard
+            return
+        doc_id = len(self.file_ids)
+        self.file_ids.append(file_id)
+        self.shards.append(shard)
+        self.doc_ids[file_id] = doc_id
+        tokens = tokenize(file_name)
+        self.lengths.append(min(len(tokens), 65535))
+        self.total_length += len(tokens)
+        if self.keep_names:
+            self.names.append(file_name)
+        for token in set(tokens):
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = array('I')
+                if sort_vocab:
+                    insort(self.vocab, token)
+            posting.append(doc_id)
+        if self.trigrams:
+            grams = trigrams(file_name)
+            self.gram_counts.append(min(len(grams), 65535))
+            for gram in grams:
+                posting = self.grams.get(gram)
+                if posting is None:
+                    posting = self.grams[gram] = array('I')
+                posting.append(doc_id)
+        for key in field_keys(parse_file_name(file_name)):
+            posting = self.fields.get(key)
+            if posting is None:
+                posting = self.fields[key] = array('I')
+            posting.append(doc_id)
+
+    def _remove(self, file_id):
+        doc_id = self.doc_ids.pop(file_id, None)
+        if doc_id is not None:
+            self.deleted.add(doc_id)
+
+    def add(self, file_id, file_name, shard=0):
+        """Index a newly saved file, or record the new collection of a moved one."""
+        if not self.ready:
+            self._pending.append((True, file_id, file_name, shard))
+            return
+        self._add(file_id, file_name, shard)
+
+    def remove(self, file_id):
+        """Drop a deleted file from search results."""
+        if not self.ready:
+            self._pending.append((False, file_id, None, None))
+            return
+        self._remove(file_id)
+
+    @staticmethod
+    def _stream(collection, shard):
+        cursor = collection.find({}, {'_id': 1, 'file_id': 1, 'file_name': 1}).sort('_id', 1).batch_size(5000)
+        for doc in cursor:
+            yield doc['_id'], shard, doc
+
+    def _load(self, collections):
+        # merged on _id so doc ids follow save order across shards instead of shard after shard
+        streams = [self._stream(collection, shard) for shard, collection in enumerate(collections)]
+        for _, shard, doc in heapq.merge(*streams, key=lambda item: item[0]):
+            self._add(doc['file_id'], doc.get('file_name', ''), shard, sort_vocab=False)
+        self.vocab = sorted(self.postings)
+
+    async def build(self, collections):
+        """Build the index from the given file collections without blocking the event loop.
+
+        Saves and deletes that happen while the build runs are queued and
+        replayed once the snapshot is loaded.
+        """
+        self.ready = False
+        fresh = FileIndex(self.trigrams, self.keep_names)
+        await asyncio.get_event_loop().run_in_executor(None, fresh._load, collections)
+        pending = self._pending
+        self.__dict__.update(fresh.__dict__)
+        self._pending = pending
+        for is_add, file_id, file_name, shard in self._pending:
+            if is_add:
+                self._add(file_id, file_name, shard)
+            else:
+                self._remove(file_id)
+        self._pending = []
+        self.ready = True
+        logger.info(f"File index built with {len(self)} files and {len(self.postings)} tokens.")
+
+    def _prefix_posting(self, prefix):
+        start = bisect_left(self.vocab, prefix)
+        postings = []
+        for token in self.vocab[start:]:
+            if not token.startswith(prefix):
+                break
+            postings.append(self.postings[token])
+        if len(postings) < 2:
+            return postings[0] if postings else None
+        return array('I', sorted(set().union(*postings)))
+
+    def _field_postings(self, fields):
+        empty = array('I')
+        return [self.fields.get(key, empty) for key in field_keys(fields or {})]
+
+    def with_fields(self, hits, fields):
+        """Keep the hits, in order, whose parsed metadata equals every given field."""
+        postings = self._field_postings(fields)
+        if not postings or hits is None:
+            return hits
+        return [doc_id for doc_id in hits if all(_contains(posting, doc_id) for posting in postings)]
+
+    def facets(self, hits, names):
+        """Count hits per value of the given metadata fields, e.g. {'year': {'2019': 4}}.
+
+        Each field posting is intersected with the hits from whichever side is
+        shorter: membership in a set of the hits, or binary search in the posting.
+        """
+        counts = {name: {} for name in names}
+        hit_set = None
+        for key, posting in self.fields.items():
+            name, _, value = key.partition(':')
+            if name not in counts:
+                continue
+            if len(posting) < len(hits):
+                hit_set = hit_set or set(hits)
+                count = sum(1 for doc_id in posting if doc_id in hit_set)
+            else:
+                count = sum(1 for doc_id in hits if _contains(posting, doc_id))
+            if count:
+                counts[name][value] = count
+        return counts
+
+    def search(self, query, fields=None):
+        """Return doc ids matching every query token, newest first.
+
+        A single word must match a whole token; in a multi word query the
+        last word may also be a prefix, like the old regex search allowed.
+        fields ({'year': 2019, ...}) must equal the metadata parsed from the name.
+        Returns None when the index cannot answer, so callers fall back to
+        a database scan.
+        """
+        if not self.ready:
+            return None
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return None
+        lists = []
+        for token in tokens[:-1]:
+            posting = self.postings.get(token)
+            if not posting:
+                return []
+            lists.append(posting)
+        last = self._prefix_posting(tokens[-1]) if lists else self.postings.get(tokens[-1])
+        if not last:
+            return []
+        lists.append(last)
+        lists.extend(self._field_postings(fields))
+        lists.sort(key=len)
+        hits = lists[0]
+        for posting in lists[1:]:
+            hits = [doc_id for doc_id in hits if _contains(posting, doc_id)]
+            if not hits:
+                return []
+        deleted = self.deleted
+        return [doc_id for doc_id in reversed(hits) if doc_id not in deleted]
+
+    def fuzzy_search(self, query, min_similarity=0.4):
+        """Return doc ids sharing enough trigrams with the query, best match first.
+
+        Candidates come from the rarest query trigrams only: a name sharing at
+        least `need` of the query's trigrams must contain one of its
+        len(grams) - need + 1 rarest ones. The other trigrams are then just
+        checked for membership. Returns None when trigrams are not indexed.
+        """
+        if not self.ready or not self.trigrams:
+            return None
+        grams = trigrams(query)
+        if not grams:
+            return None
+        empty = array('I')
+        postings = sorted((self.grams.get(gram, empty) for gram in grams), key=len)
+        need = max(1, math.ceil(len(grams) * min_similarity))
+        probe = len(grams) - need + 1
+        shared = Counter()
+        for posting in postings[:probe]:
+            shared.update(posting)
+        for posting in postings[probe:]:
+            for doc_id in shared:
+                if _contains(posting, doc_id):
+                    shared[doc_id] += 1
+        deleted = self.deleted
+        scored = []
+        for doc_id, count in shared.items():
+            if count < need or doc_id in deleted:
+                continue
+            # how much of the query was found, then Dice to prefer tighter names, then newest
+            dice = 2 * count / (len(grams) + self.gram_counts[doc_id])
+            scored.append((count / len(grams), dice, doc_id))
+        scored.sort(reverse=True)
+        return [doc_id for _, _, doc_id in scored]
+
+    def bm25_search(self, query):
+        """Return doc ids ranked by BM25 over name tokens, best match first.
+
+        A file has to contain about 60% of the query words, so chatty queries
+        still find the title. Like fuzzy_search, candidates come from the
+        rarest words and the common ones are only checked by binary search.
+        When names are kept, the top files get a boost for starting with the
+        query title and for matching a year in the query.
+        """
+        if not self.ready:
+            return None
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return None
+        live = len(self) or 1
+        average = (self.total_length / len(self.file_ids)) if self.file_ids else 1
+        empty = array('I')
+        terms = []
+        for token in tokens:
+            posting = self.postings.get(token) or self._prefix_posting(token) or empty
+            idf = math.log(1 + (live - len(posting) + 0.5) / (len(posting) + 0.5))
+            terms.append((posting, idf))
+        terms.sort(key=lambda term: len(term[0]))
+        need = max(1, math.ceil(len(tokens) * 0.6))
+        probe = len(tokens) - need + 1
+        matched = Counter()
+        scores = Counter()
+        lengths = self.lengths
+        for index, (posting, idf) in enumerate(terms):
+            docs = posting if index < probe else [doc_id for doc_id in matched if _contains(posting, doc_id)]
+            for doc_id in docs:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc_id] / average)
+                scores[doc_id] += idf * (BM25_K1 + 1) / (1 + norm)
+                matched[doc_id] += 1
+        deleted = self.deleted
+        ranked = sorted(
+            ((score, doc_id) for doc_id, score in scores.items() if matched[doc_id] >= need and doc_id not in deleted),
+            reverse=True
+        )
+        if self.keep_names and ranked:
+            ranked = self._boost(tokens, ranked[:500]) + ranked[500:]
+        return [doc_id for _, doc_id in ranked]
+
+    def _boost(self, tokens, ranked):
+        years = {token for token in tokens if YEAR_RE.match(token)}
+        title = [token for token in tokens if token not in years]
+        boosted = []
+        for score, doc_id in ranked:
+            name = tokenize(self.names[doc_id])
+            if title and name[:len(title)] == title:
+                score += TITLE_BOOST
+            if years and years.intersection(name):
+                score += YEAR_BOOST
+            boosted.append((score, doc_id))
+        boosted.sort(reverse=True)
+        return boosted
+
+    def locate(self, doc_id):
+        """Return (file_id, shard) for a doc id."""
+        return self.file_ids[doc_id], self.shards[doc_id]
+
+
+file_index = FileIndex(trigrams=SEARCH_MODE == 'fuzzy', names=SEARCH_MODE == 'bm25')
@@ -0,0 +1,115 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import re
+
+# Bump when the parser changes so the backfill re-parses stored files
+FIELDS_VERSION = 1
+
+LANGUAGE_ALIASES = {
+    'malayalam': 'malayalam', 'mal': 'malayalam',
+    'tamil': 'tamil', 'tam': 'tamil',
+    'english': 'english', 'eng': 'english',
+    'hindi': 'hindi', 'hin': 'hindi',
+    'telugu': 'telugu', 'tel': 'telugu',
+    'kannada': 'kannada', 'kan': 'kannada',
+    'bengali': 'bengali', 'ben': 'bengali',
+    'marathi': 'marathi', 'mar': 'marathi',
+    'punjabi': 'punjabi',
+    'korean': 'korean', 'kor': 'korean',
+    'japanese': 'japanese', 'jap': 'japanese',
+    'chinese': 'chinese',
+    'spanish': 'spanish',
+    'french': 'french',
+}
+SOURCES = {
+    'webdl': 'webdl', 'webrip': 'webrip', 'bluray': 'bluray', 'brrip': 'bluray', 'bdrip': 'bluray',
+    'hdrip': 'hdrip', 'dvdrip': 'dvdrip', 'hdtv': 'hdtv', 'predvd': 'predvd',
+    'hdcam': 'cam', 'camrip': 'cam', 'cam': 'cam', 'hdts': 'ts', 'ts': 'ts',
+}
+CODECS = {'x264': 'x264', 'h264': 'x264', 'avc': 'x264', 'x265': 'x265', 'h265': 'x265', 'hevc': 'x265', 'av1': 'av1'}
+
+YEAR_RE = re.compile(r"\b(19\d\d|20\d\d)\b")
+SEASON_EPISODE_RE = re.compile(r"\bs(\d{1,2})\s?ep?(\d{1,3})\b", re.IGNORECASE)
+SEASON_RE = re.compile(r"\b(?:s|season\s?)(\d{1,2})\b", re.IGNORECASE)
+EPISODE_RE = re.compile(r"\b(?:e|ep|episode\s?)(\d{1,3})\b", re.IGNORECASE)
+RESOLUTION_RE = re.compile(r"\b(?:(360|480|540|576|720|1080|1440|2160)p|(4k|uhd))\b", re.IGNORECASE)
+SOURCE_RE = re.compile(r"\b(web\s?dl|web\s?rip|blu\s?ray|br\s?rip|bd\s?rip|hd\s?rip|dvd\s?rip|hdtv|pre\s?dvd|hd\s?cam|cam\s?rip|cam|hd\s?ts|ts)\b", re.IGNORECASE)
+CODEC_RE = re.compile(r"\b(x264|x265|h\s?264|h\s?265|hevc|avc|av1)\b", re.IGNORECASE)
+WORD_RE = re.compile(r"[^\W_]+")
+TITLE_END_RE = re.compile(r"^(?:(?:19|20)\d\d|s\d{1,2}(?:e\d{1,3})?|e\d{1,3}|ep|season|episode|\d{3,4}p|4k|uhd)$")
+LANGUAGE_RE = re.compile(r"\b(" + "|".join(sorted(LANGUAGE_ALIASES, key=len, reverse=True)) + r")\b", re.IGNORECASE)
+
+
+def parse_file_name(file_name):
+    """Pull year, season, episode, resolution, source, codec and languages out of a cleaned file name.
+
+    Only the fields that were found are returned, ready to be stored on the file document.
+    """
+    name = str(file_name)
+    fields = {}
+    years = YEAR_RE.findall(name)
+    if years:
+        # a title can contain a year-like number (Blade Runner 2049 2017), the release year comes last
+        fields['year'] = int(years[-1])
+    match = SEASON_EPISODE_RE.search(name)
+    if match:
+        fields['season'], fields['episode'] = int(match.group(1)), int(match.group(2))
+    else:
+        match = SEASON_RE.search(name)
+        if match:
+            fields['season'] = int(match.group(1))
+        match = EPISODE_RE.search(name)
+        if match:
+            fields['episode'] = int(match.group(1))
+    match = RESOLUTION_RE.search(name)
+    if match:
+        fields['resolution'] = f"{match.group(1)}p" if match.group(1) else '2160p'
+    match = SOURCE_RE.search(name)
+    if match:
+        fields['source'] = SOURCES[re.sub(r"\s", "", match.group(1).lower())]
+    match = CODEC_RE.search(name)
+    if match:
+        fields['codec'] = CODECS[re.sub(r"\s", "", match.group(1).lower())]
+    languages = list(dict.fromkeys(LANGUAGE_ALIASES[word.lower()] for word in LANGUAGE_RE.findall(name)))
+    if languages:
+        fields['languages'] = languages
+    return fields
+
+
+def parse_title(file_name):
+    """The title part of a cleaned file name: its lowercase words before the year, season, quality or language."""
+    words = []
+    for word in WORD_RE.findall(str(file_name).lower()):
+        # the first word always stays, for titles like 2012 or 1917
+        if words and (TITLE_END_RE.match(word) or word in LANGUAGE_ALIASES or word in SOURCES or word in CODECS):
+            break
+        words.append(word)
+    return ' '.join(words)
+
+
+def filter_fields(kind, value):
+    """Map a choice from the year/episode/language/quality/season menus to stored field values."""
+    value = str(value).lower()
+    digits = re.sub(r"\D", "", value)
+    if kind == 'year' and digits:
+        return {'year': int(digits)}
+    if kind == 'episode' and digits:
+        return {'episode': int(digits)}
+    if kind == 'season' and digits:
+        return {'season': int(digits)}
+    if kind == 'quality':
+        return {'resolution': value}
+    if kind == 'language':
+        return {'languages': LANGUAGE_ALIASES.get(value, value)}
+    return None
+
+
+def field_keys(fields):
+    """Flatten stored fields into 'name:value' keys, as used by the in-memory index."""
+    keys = []
+    for name, value in fields.items():
+        for item in (value if isinstance(value, list) else [value]):
+            keys.append(f"{name}:{item}")
+    return keys
@@ -0,0 +1,125 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import time, asyncio, logging
+from collections import Counter, deque
+from info import HOT_QUERY_WINDOW, HOT_QUERY_COUNT, HOT_QUERY_REFRESH, CUSTOM_FILE_CAPTION
+from database.ia_filterdb import get_search_results, get_inline_results, DISPLAY_FIELDS
+from database.search_cache import file_generation, normalize_query
+from helper import get_size
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def button_text(file):
+    """Text of a file's result button: size, then the name without [tags], @mentions and links."""
+    name = ' '.join(word for word in file['file_name'].split() if not word.startswith(('[', '@', 'www.')))
+    return f"[{get_size(file['file_size'])}] {name}"
+
+
+def inline_caption(file):
+    """Caption of a file's inline result: CUSTOM_FILE_CAPTION when set, else the saved caption or the name."""
+    title = file['file_name']
+    f_caption = file.get('caption')
+    if CUSTOM_FILE_CAPTION:
+        try:
+            f_caption = CUSTOM_FILE_CAPTION.format(file_name='' if title is None else title, file_size=get_size(file['file_size']), file_caption='' if f_caption is None else f_caption)
+        except Exception as e:
+            logger.exception(e)
+    if f_caption is None:
+        f_caption = f"{file['file_name']}"
+    return f_caption
+
+
+class HotQueries:
+    """Counts searches over a sliding window and keeps the first page of the top ones ready.
+
+    The window is split into time slices; a search increments the current
+    slice and slices older than the window are dropped, so the top list
+    follows what is searched right now. A background task re-runs the top
+    searches whenever files changed and keeps their first page, total and
+    rendered texts, so those searches skip the index and database entirely.
+    """
+
+    SLICES = 12
+
+    def __init__(self, window, size, refresh):
+        self.slice = window / self.SLICES
+        self.size = size
+        self.refresh = refresh
+        self.counts = deque()  # (slice number, Counter of (kind, query))
+        self.pages = {}        # (kind, query) -> (file generation, (files, next_offset, total_results, texts))
+        self.hits = 0
+        self.misses = 0
+
+    def _now(self):
+        return int(time.monotonic() / self.slice)
+
+    def record(self, kind, query):
+        """Count one search; kind is 'search' for group searches or 'inline'."""
+        if not self.size:
+            return
+        now = self._now()
+        if not self.counts or self.counts[-1][0] != now:
+            self.counts.append((now, Counter()))
+            while self.counts[0][0] <= now - self.SLICES:
+                self.counts.popleft()
+        self.counts[-1][1][(kind, normalize_query(query))] += 1
+
+    def top(self):
+        """The most searched (kind, query) pairs of the window, most searched first."""
+        oldest = self._now() - self.SLICES
+        total = Counter()
+        for number, counts in self.counts:
+            if number > oldest:
+                total.update(counts)
+        return [key for key, _ in total.most_common(self.size)]
+
+    def get(self, kind, query):
+        """The warm first page as (files, next_offset, total_results, texts), or None."""
+        entry = self.pages.get((kind, normalize_query(query)))
+        if entry is None or entry[0] != file_generation.value:
+            self.misses += 1
+            return None
+        self.hits += 1
+        files, next_offset, total_results, texts = entry[1]
+        # callers extend the lists they get back, keep the warm page intact
+        return list(files), next_offset, total_results, list(texts)
+
+    async def _load(self, kind, query):
+        if kind == 'inline':
+            files, next_offset, total_results = await get_inline_results(None, query, max_results=10, projection=DISPLAY_FIELDS + ('caption',))
+            texts = [inline_caption(file) for file in files]
+        else:
+            files, next_offset, total_results = await get_search_results(None, query, projection=DISPLAY_FIELDS)
+            texts = [button_text(file) for file in files]
+        return files, next_offset, total_results, texts
+
+    async def warm(self):
+        """Keep the pages of the current top searches fresh, forever."""
+        if not self.size:
+            return
+        while True:
+            await asyncio.sleep(self.refresh)
+            try:
+                pages = {}
+                for key in self.top():
+                    entry = self.pages.get(key)
+                    if entry is None or entry[0] != file_generation.value:
+                        # remember the generation the page was read at, a save during the read makes it stale
+                        generation = file_generation.value
+                        entry = (generation, await self._load(*key))
+                    pages[key] = entry
+                self.pages = pages
+            except Exception as e:
+                logger.exception(e)
+
+    def stats(self):
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0
+        return f"{len(self.pages)} warm searches, {self.hits} hits, {self.misses} misses ({ratio:.1f}% hit rate)"
+
+
+hot_queries = HotQueries(HOT_QUERY_WINDOW, HOT_QUERY_COUNT, HOT_QUERY_REFRESH)
@@ -2,59 +2,212 @@
 # Subscribe YouTube Channel For Amazing Bot @Tech_VJ
 # Ask Doubt on telegram @KingVJ01
 
-import re, base64, json
+import re, base64, json, heapq, asyncio
+import motor.motor_asyncio
+from bisect import bisect_right
 from struct import pack
+from bson.objectid import ObjectId
 from pyrogram.file_id import FileId
-from pymongo import MongoClient
-from pymongo.errors import DuplicateKeyError
-from info import FILE_DB_URI, SEC_FILE_DB_URI, DATABASE_NAME, COLLECTION_NAME, MULTIPLE_DATABASE, USE_CAPTION_FILTER, MAX_B_TN
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError, OperationFailure
+from info import FILE_DB_URIS, FILE_READ_URIS, READ_PREFERENCE, MAX_STALENESS, READ_POOL_SIZE, WRITE_POOL_SIZE, DATABASE_NAME, COLLECTION_NAME, USE_CAPTION_FILTER, MAX_B_TN, SEARCH_MODE, SEARCH_BACKEND, SQLITE_DB_PATH
+from database.file_index import file_index, tokenize
+from database.search_cache import file_generation, count_cache, result_cache, inline_cache, normalize_query
+from database.file_metadata import parse_file_name, parse_title, FIELDS_VERSION
+from database.title_matcher import title_matcher
+from database.spell_dictionary import spell_dictionary
+from database.autocomplete import PrefixIndex, title_prefixes
+from database.search_backend import SearchBackend
+from database.sqlite_backend import SqliteBackend
+from database.shard_map import HashRing
+from utils.singleflight import SingleFlight
 
-# First Database For File Saving 
-client = MongoClient(FILE_DB_URI)
-db = client[DATABASE_NAME]
-col = db[COLLECTION_NAME]
+# One file database per url in FILE_DB_URIS, each file lives on the shard its file_id hashes to
+FILE_DATABASES = [MongoClient(uri, maxPoolSize=WRITE_POOL_SIZE)[DATABASE_NAME] for uri in FILE_DB_URIS]
+FILE_COLLECTIONS = [database[COLLECTION_NAME] for database in FILE_DATABASES]
+shard_ring = HashRing(len(FILE_COLLECTIONS))
 
-# Second Database For File Saving
-sec_client = MongoClient(SEC_FILE_DB_URI)
-sec_db = sec_client[DATABASE_NAME]
-sec_col = sec_db[COLLECTION_NAME]
+# Async clients on the primaries, for background jobs that read and write files
+ASYNC_FILE_COLLECTIONS = [motor.motor_asyncio.AsyncIOMotorClient(uri, maxPoolSize=WRITE_POOL_SIZE)[DATABASE_NAME][COLLECTION_NAME] for uri in FILE_DB_URIS]
 
+# Async clients used for search reads, so every file database is queried at once and
+# search traffic can be kept off the primaries that save files
+if len(FILE_READ_URIS) != len(FILE_DB_URIS):
+    print("FILE_READ_URIS Needs One Url Per FILE_DB_URIS Url, Searches Will Read From FILE_DB_URIS.")
+    FILE_READ_URIS = FILE_DB_URIS
+READ_OPTIONS = {'readPreference': READ_PREFERENCE, 'maxPoolSize': READ_POOL_SIZE}
+if MAX_STALENESS and READ_PREFERENCE != 'primary':
+    READ_OPTIONS['maxStalenessSeconds'] = MAX_STALENESS
+SEARCH_COLLECTIONS = [motor.motor_asyncio.AsyncIOMotorClient(uri, **READ_OPTIONS)[DATABASE_NAME][COLLECTION_NAME] for uri in FILE_READ_URIS]
 
-async def save_file(media):
-    """Save file in the database."""
-    
-    file_id = unpack_new_file_id(media.file_id)
+
+# Indexes of the collections whose documents all carry a tokens array
+tokens_backfilled = set()
+
+# Identical searches and counts running at the same time share one database round trip
+search_flight = SingleFlight('Searches')
+count_flight = SingleFlight('Counts')
+
+# Metadata fields the filter menus show counts for
+FACET_FIELDS = ('resolution', 'languages', 'season', 'episode', 'year')
+
+# What result buttons render; pass as projection and load the caption with get_file_details on delivery
+DISPLAY_FIELDS = ('file_id', 'file_name', 'file_size')
+
+
+async def build_file_index():
+    """Load every saved file name into the in-memory search index and the title matcher."""
+    if SEARCH_BACKEND == 'sqlite':
+        await title_matcher.build(parse_title(name) for name in saved_file_names())
+        await load_title_prefixes()
+        return
+    # index builds on a big collection take a while, keep them off the event loop
+    loop = asyncio.get_event_loop()
+    await asyncio.gather(*(loop.run_in_executor(None, create_file_indexes, collection) for collection in FILE_COLLECTIONS))
+    await file_index.build(FILE_COLLECTIONS)
+    await title_matcher.build(parse_title(name) for name in saved_file_names())
+    await load_title_prefixes()
+
+
+async def load_title_prefixes():
+    """Fill the inline autocomplete index from the distinct titles of the title matcher."""
+    titles = list(title_matcher.titles)
+    fresh = PrefixIndex()
+    await asyncio.get_event_loop().run_in_executor(None, fresh.load, titles)
+    title_prefixes.__dict__.update(fresh.__dict__)
+    for title in title_matcher.titles[len(titles):]:
+        title_prefixes.add(title)
+
+
+def saved_file_names():
+    """Every saved file name, read lazily so it can be consumed in a worker thread."""
+    if SEARCH_BACKEND == 'sqlite':
+        yield from backend.file_names()
+        return
+    for collection in FILE_COLLECTIONS:
+        for doc in collection.find({}, {'_id': 0, 'file_name': 1}).batch_size(5000):
+            yield doc.get('file_name', '')
+
+
+def create_file_indexes(collection):
+    """Create the indexes searches and saves rely on, blocking until MongoDB has built them."""
+    ensure_unique_file_ids(collection)
+    collection.create_index('file_name')
+    collection.create_index('tokens')
+    collection.create_index('fields_v')
+    # tokens and languages are both arrays, so they can't share a compound index
+    collection.create_index([('tokens', 1), ('year', 1)])
+    collection.create_index([('tokens', 1), ('season', 1), ('episode', 1)])
+    collection.create_index([('tokens', 1), ('resolution', 1)])
+    collection.create_index('languages')
+
+
+def ensure_unique_file_ids(collection):
+    """Make the file_id index unique, so batched inserts can leave duplicate detection to it."""
+    index = collection.index_information().get('file_id_1')
+    if index and index.get('unique'):
+        return
+    try:
+        if index:
+            collection.drop_index('file_id_1')
+        collection.create_index('file_id', unique=True)
+    except OperationFailure as e:
+        # duplicate file_ids saved before the index existed, keep a plain one
+        print(f"File Ids Are Not Unique In {collection.database.name}, Keeping A Plain Index: {e}")
+        collection.create_index('file_id')
+
+
+def file_db_stats():
+    """(files, used MB, free MB) of the first file database and of all the others together, for the stats commands."""
+    stats = []
+    for database, collection in zip(FILE_DATABASES, FILE_COLLECTIONS):
+        sizes = database.command('dbStats')
+        used = (sizes['dataSize'] + sizes['indexSize']) / (1024 * 1024)
+        # every database is assumed to be a free 512 MB cluster
+        stats.append((collection.count_documents({}), used, 512 - used))
+    first, others = stats[0], stats[1:]
+    return first, tuple(sum(values) for values in zip(*others)) if others else (0, 0, 0)
+
+
+async def build_spell_dictionary():
+    """Load or build the spelling dictionary of file name words and keep its file up to date."""
+    await spell_dictionary.build(saved_file_names())
+
+
+def file_tokens(file_name):
+    """Lowercase, deduplicated words of a file name, stored as the multikey 'tokens' field."""
+    return list(dict.fromkeys(tokenize(file_name)))
+
+
+def file_fields(file_name):
+    """Search fields stored on a file document: the tokens array plus parsed metadata."""
+    return {'tokens': file_tokens(file_name), **parse_file_name(file_name), 'fields_v': FIELDS_VERSION}
+
+
+async def backfill_file_tokens(batch_size=1000, pause=0.5):
+    """Add the tokens array and metadata fields to files saved before they existed, a batch at a time."""
+    if SEARCH_BACKEND == 'sqlite':
+        return
+    for shard, collection in enumerate(ASYNC_FILE_COLLECTIONS):
+        done = 0
+        while True:
+            docs = await collection.find({'fields_v': {'$ne': FIELDS_VERSION}}, {'file_name': 1}).to_list(length=batch_size)
+            if not docs:
+                break
+            await collection.bulk_write([
+                UpdateOne({'_id': doc['_id']}, {'$set': file_fields(doc.get('file_name', ''))})
+                for doc in docs
+            ], ordered=False)
+            done += len(docs)
+            await asyncio.sleep(pause)
+        tokens_backfilled.add(shard)
+        if done:
+            print(f"Added search tokens to {done} files of file database {shard + 1}.")
+
+
+def file_document(media):
+    """The document saved for a document, video or audio message."""
     file_name = clean_file_name(media.file_name)
-    new_file_name = f"{file_name}"
-    
-    file = {
-        'file_id': file_id,
-        'file_name': new_file_name,
+    return {
+        'file_id': unpack_new_file_id(media.file_id),
+        'file_name': file_name,
         'file_size': media.file_size,
-        'caption': media.caption.html if media.caption else None
+        'caption': media.caption.html if media.caption else None,
+        **file_fields(file_name)
     }
 
-    if is_file_already_saved(file_id, file_name):
-        return False, 0
 
-    try:
-        col.insert_one(file)
-        print(f"{file_name} is successfully saved.")
+def remember_title(file_name):
+    """Feed a newly saved name to the title matcher, the title completions and the spelling dictionary."""
+    title = parse_title(file_name)
+    if title_matcher.add(title):
+        title_prefixes.add(title)
+    spell_dictionary.add_text(file_name)
+
+
+async def save_file(media):
+    """Save file in the database."""
+    file = file_document(media)
+    saved = await backend.save(file)
+    if saved:
+        file_generation.bump()
+        remember_title(file['file_name'])
+        print(f"{file['file_name']} is successfully saved.")
         return True, 1
-    except DuplicateKeyError:
-        print(f"{file_name} is already saved.")
+    if saved is False:
         return False, 0
-    except:
-        if MULTIPLE_DATABASE:
-            try:
-                sec_col.insert_one(file)
-                print(f"{file_name} is successfully saved.")
-                return True, 1
-            except DuplicateKeyError:
-                print(f"{file_name} is already saved.")
-                return False, 0
-        else:
-            print("Your Current File Database Is Full, Turn On Multiple Database Feature And Add Second File Mongodb To Save File.")
+
+
+async def save_files(files):
+    """Save a batch of documents from file_document and return (saved, duplicates, errors)."""
+    if not files:
+        return 0, 0, 0
+    saved, errors = await backend.save_many(files)
+    if saved:
+        file_generation.bump()
+        for file in saved:
+            remember_title(file['file_name'])
+    return len(saved), len(files) - len(saved) - errors, errors
 
 def clean_file_name(file_name):
     """Clean and format the file name."""
@@ -67,55 +220,264 @@ def clean_file_name(file_name):
     return ' '.join(filter(lambda x: not x.startswith('@') and not x.startswith('http') and not x.startswith('www.') and not x.startswith('t.me'), file_name.split()))
 
 def is_file_already_saved(file_id, file_name):
-    """Check if the file is already saved in either collection."""
+    """Check if the file is already saved in any file database."""
     found1 = {'file_name': file_name}
     found = {'file_id': file_id}
 
-    for collection in [col, sec_col]:
+    for shard in shard_ring.lookup_order(file_id):
+        collection = FILE_COLLECTIONS[shard]
         if collection.find_one(found1) or collection.find_one(found):
             print(f"{file_name} is already saved.")
             return True
             
     return False
 
-async def get_search_results(chat_id, query, file_type=None, max_results=10, offset=0, filter=False):
-    """For given query return (results, next_offset)"""
-    
+def search_cursor(files):
+    """Return the keyset cursor that continues after the last file of a result page."""
+    if not files:
+        return ""
+    last = files[-1]
+    doc_id = file_index.doc_ids.get(last['file_id']) if file_index.ready else None
+    if doc_id is not None:
+        return str(doc_id)
+    if isinstance(last.get('_id'), ObjectId):
+        # 16 chars without "_" so it fits inside next_{req}_{key}_{offset} callback data
+        return base64.b64encode(last['_id'].binary, altchars=b'-~').decode()
+    return ""
+
+def _cursor_object_id(cursor):
+    try:
+        return ObjectId(base64.b64decode(cursor, altchars=b'-~'))
+    except Exception:
+        return None
+
+async def get_search_results(chat_id, query, file_type=None, max_results=10, offset=0, filter=False, cursor=None, mode=None, fields=None, projection=None):
+    """For given query return (results, next_offset)
+
+    When cursor (from search_cursor) is given the page starts right after it
+    instead of skipping offset files; offset is then only used for numbering.
+    mode picks the search flavour and defaults to SEARCH_MODE ('token', 'fuzzy' or 'bm25').
+    fields ({'year': 2019}, {'languages': 'tamil'}, ...) must equal the metadata parsed at ingest.
+    projection (e.g. DISPLAY_FIELDS) limits the document fields returned; _id is always kept.
+    Pages are served from result_cache until it expires or a file is saved or deleted.
+    """
+    mode = mode or SEARCH_MODE
+    fields = fields or {}
+    key = (normalize_query(query), tuple(sorted(fields.items())), offset, max_results, cursor or "", mode, tuple(projection or ()))
+    result = result_cache.get(key)
+    if result is None:
+        # read before searching, a file saved meanwhile must make this result stale
+        generation = file_generation.value
+        result = await search_flight.do((key, generation), backend.search, [query], max_results, offset, fields, projection, cursor, mode)
+        result_cache.set(key, result, generation)
+    files, next_offset, total_results = result
+    # callers extend the list they get back, keep the cached page intact
+    return list(files), next_offset, total_results
+
+async def _get_search_results(query, max_results, offset, cursor, mode, fields, projection):
     query = query.strip()
-    if not query:
-        raw_pattern = '.'
-    elif ' ' not in query:
-        raw_pattern = r'(\b|[\.\+\-_])' + query + r'(\b|[\.\+\-_])'
+    # fuzzy and bm25 hits are ranked by score, so only token hits can resume from a doc id cursor
+    if mode == 'fuzzy':
+        hits = file_index.with_fields(file_index.fuzzy_search(query), fields)
+    elif mode == 'bm25':
+        hits = file_index.with_fields(file_index.bm25_search(query), fields)
     else:
-        raw_pattern = query.replace(' ', r'.*[\s\.\+\-_]') 
-    try:
-        regex = re.compile(raw_pattern, flags=re.IGNORECASE)
-    except:
-        regex = query
-    filter = {'file_name': regex}
-    files = []
-    if MULTIPLE_DATABASE:
-        cursor1 = col.find(filter).sort('$natural', -1).skip(offset).limit(max_results)
-        cursor2 = sec_col.find(filter).sort('$natural', -1).skip(offset).limit(max_results)
-        
-        for file in cursor1:
-            files.append(file)
-        for file in cursor2:
-            files.append(file)
+        hits = None
+    ranked = hits is not None
+    if not ranked:
+        hits = file_index.search(query, fields)
+    if hits is not None:
+        total_results = len(hits)
+        start = offset
+        if cursor and cursor.isdigit() and not ranked:
+            # the cursor is the last file already shown, start right after it
+            start = bisect_right(hits, -int(cursor), key=lambda doc_id: -doc_id)
+        files = await fetch_indexed_files(hits[start:start + max_results], projection)
+        next_offset = "" if (start + max_results) >= total_results else (offset + max_results)
+        return files, next_offset, total_results
+
+    filter = {**query_filter(query), **fields}
+    after = _cursor_object_id(cursor) if cursor else None
+    count_key = (normalize_query(query), tuple(sorted(fields.items())))
+    return await _find_page(filter, max_results, offset, after, count_key, projection)
+
+async def _find_page(filter, max_results, offset, after, count_key, projection=None):
+    if after is not None:
+        # keyset page: every collection resumes below the last _id seen
+        page_filter, skip, limit = {**filter, '_id': {'$lt': after}}, 0, max_results
+    elif len(SEARCH_COLLECTIONS) == 1:
+        page_filter, skip, limit = filter, offset, max_results
     else:
-        cursor = col.find(filter).sort('$natural', -1).skip(offset).limit(max_results)
-        
-        for file in cursor:
-            files.append(file)
+        # the offset applies to the merged stream, so take the first offset + max_results of each collection
+        page_filter, skip, limit = filter, 0, offset + max_results
+    total_results = count_cache.get(count_key)
+    if total_results is None:
+        generation = file_generation.value
+        files, total_results = await asyncio.gather(
+            find_merged(page_filter, skip, limit, projection),
+            count_flight.do((count_key, generation), count_all, filter)
+        )
+        count_cache.set(count_key, total_results, generation)
+    else:
+        files = await find_merged(page_filter, skip, limit, projection)
+    files = files[limit - max_results:limit]
 
-    total_results = col.count_documents(filter) if not MULTIPLE_DATABASE else (col.count_documents(filter) + sec_col.count_documents(filter))
     next_offset = "" if (offset + max_results) >= total_results else (offset + max_results)
 
     return files, next_offset, total_results
 
+async def get_multi_search_results(chat_id, queries, max_results=10, offset=0, projection=None):
+    """Like get_search_results, for files matching any of several alternative queries.
+
+    The alternatives are answered together: one union of index hits, or one
+    $or query per collection, deduplicated, newest first and paginated.
+    """
+    queries = [query.strip() for query in queries if query and query.strip()]
+    if not queries:
+        return [], "", 0
+    key = ('any', tuple(normalize_query(query) for query in queries), offset, max_results, tuple(projection or ()))
+    result = result_cache.get(key)
+    if result is None:
+        generation = file_generation.value
+        result = await search_flight.do((key, generation), backend.search, queries, max_results, offset, projection=projection)
+        result_cache.set(key, result, generation)
+    files, next_offset, total_results = result
+    return list(files), next_offset, total_results
+
+async def _get_multi_search_results(queries, max_results, offset, projection):
+    lists = [file_index.search(query) for query in queries]
+    if all(hits is not None for hits in lists):
+        hits = sorted(set().union(*lists), reverse=True)
+        total_results = len(hits)
+        files = await fetch_indexed_files(hits[offset:offset + max_results], projection)
+        next_offset = "" if (offset + max_results) >= total_results else (offset + max_results)
+        return files, next_offset, total_results
+    filter = {'$or': [query_filter(query) for query in queries]}
+    count_key = ('any',) + tuple(normalize_query(query) for query in queries)
+    return await _find_page(filter, max_results, offset, None, count_key, projection)
+
+async def get_inline_results(user_id, query, max_results=10, offset=0, projection=None):
+    """Search-as-you-type results for inline queries, as (results, next_offset, total_results).
+
+    Files matching the query itself or any saved title the query is the
+    start of are returned together. Each user's pages are kept for
+    INLINE_CACHE_TIME seconds, so backspacing and retyping is free.
+    """
+    key = (user_id, normalize_query(query), offset, max_results, tuple(projection or ()))
+    result = inline_cache.get(key)
+    if result is None:
+        generation = file_generation.value
+        titles = title_prefixes.complete(normalize_query(query))
+        if titles:
+            result = await get_multi_search_results(None, [query] + titles, max_results, offset, projection)
+        else:
+            # also covers the empty query, which lists the newest files
+            result = await get_search_results(None, query, max_results=max_results, offset=offset, projection=projection)
+        inline_cache.set(key, result, generation)
+    files, next_offset, total_results = result
+    return list(files), next_offset, total_results
+
+async def closest_titles(query, limit=5):
+    """Saved titles closest to a query, best first, keeping only titles that still return files."""
+    titles = [title for title, _ in title_matcher.match(parse_title(query) or query, limit * 2)]
+    results = await asyncio.gather(*(get_search_results(None, title, max_results=1, projection=DISPLAY_FIELDS) for title in titles))
+    return [title for title, (_, _, total_results) in zip(titles, results) if total_results][:limit]
+
+def query_filter(query):
+    """Database filter for a search query: the tokens array when backfilled, else a file_name regex."""
+    filter = token_filter(query)
+    if filter is None:
+        if not query:
+            raw_pattern = '.'
+        elif ' ' not in query:
+            raw_pattern = r'(\b|[\.\+\-_])' + query + r'(\b|[\.\+\-_])'
+        else:
+            raw_pattern = query.replace(' ', r'.*[\s\.\+\-_]') 
+        try:
+            regex = re.compile(raw_pattern, flags=re.IGNORECASE)
+        except:
+            regex = query
+        filter = {'file_name': regex}
+    return filter
+
+async def get_facets(query):
+    """Count the files matching query per value of every FACET_FIELDS field, in one pass."""
+    return await backend.facets(query.strip(), FACET_FIELDS)
+
+def token_filter(query):
+    """Indexed filter on the tokens array, or None while old files still lack it.
+
+    Like the in-memory index, a single word must match a whole token and the
+    last word of a longer query may be a prefix (an anchored regex, which
+    still uses the multikey index).
+    """
+    tokens = file_tokens(query)
+    if not tokens or len(tokens_backfilled) < len(FILE_COLLECTIONS):
+        return None
+    if len(tokens) == 1:
+        return {'tokens': tokens[0]}
+    return {'$and': [
+        {'tokens': {'$all': tokens[:-1]}},
+        {'tokens': re.compile('^' + re.escape(tokens[-1]))}
+    ]}
+
+async def find_merged(filter, skip=0, limit=0, projection=None):
+    """Query every file collection concurrently and k-way merge the results newest first."""
+    streams = await asyncio.gather(*(
+        collection.find(filter, projection).sort('_id', -1).skip(skip).limit(limit).to_list(length=None)
+        for collection in SEARCH_COLLECTIONS
+    ))
+    files = []
+    for file in heapq.merge(*streams, key=lambda file: file['_id'], reverse=True):
+        # a file being rebalanced can briefly be in two collections
+        if not files or files[-1]['_id'] != file['_id']:
+            files.append(file)
+    return files
+
+async def count_all(filter):
+    """Count matching files across every file collection concurrently."""
+    counts = await asyncio.gather(*(collection.count_documents(filter) for collection in SEARCH_COLLECTIONS))
+    return sum(counts)
+
+async def fetch_indexed_files(doc_ids, projection=None):
+    """Load the documents for index hits, keeping the hit order."""
+    by_shard = {}
+    for doc_id in doc_ids:
+        file_id, shard = file_index.locate(doc_id)
+        by_shard.setdefault(shard, []).append(file_id)
+    found = {}
+    batches = await asyncio.gather(*(
+        SEARCH_COLLECTIONS[shard].find({'file_id': {'$in': file_ids}}, projection).to_list(length=None)
+        for shard, file_ids in by_shard.items()
+    ))
+    for batch in batches:
+        for file in batch:
+            found[file['file_id']] = file
+    missing = [file_id for file_ids in by_shard.values() for file_id in file_ids if file_id not in found]
+    if missing:
+        # saved after a secondary last replicated, or moved by the rebalancer after
+        # the index was read: ask every primary
+        batches = await asyncio.gather(*(
+            collection.find({'file_id': {'$in': missing}}, projection).to_list(length=None)
+            for collection in ASYNC_FILE_COLLECTIONS
+        ))
+        for batch in batches:
+            for file in batch:
+                found[file['file_id']] = file
+    files = []
+    for doc_id in doc_ids:
+        file = found.get(file_index.locate(doc_id)[0])
+        if file:
+            files.append(file)
+    return files
+
 async def get_bad_files(query, file_type=None, use_filter=False):
     """For given query return (results, next_offset)"""
     query = query.strip()
+    if SEARCH_BACKEND == 'sqlite':
+        total_results = await backend.count(query)
+        files, _, _ = await backend.search([query], total_results, 0) if total_results else ([], "", 0)
+        return files, total_results
     
     if not query:
         raw_pattern = '.'
@@ -133,20 +495,158 @@ async def get_bad_files(query, file_type=None, use_filter=False):
     if USE_CAPTION_FILTER:
         filter_criteria = {'$or': [filter_criteria, {'caption': regex}]}
 
-    def count_documents(collection):
-        return collection.count_documents(filter_criteria)
+    files, total_results = await asyncio.gather(
+        find_merged(filter_criteria),
+        count_all(filter_criteria)
+    )
+
+    return files, total_results
 
-    total_results = (count_documents(col) + count_documents(sec_col) if MULTIPLE_DATABASE else count_documents(col))
+async def get_file_details(query):
+    return await backend.details(query)
 
-    def find_documents(collection):
-        return list(collection.find(filter_criteria))
+async def delete_files(query):
+    """Delete files matching query and return the deleted count."""
+    deleted = await backend.delete(query)
+    if deleted:
+        file_generation.bump()
+    return deleted
 
-    files = (find_documents(col) + find_documents(sec_col) if MULTIPLE_DATABASE else find_documents(col))
+async def delete_all_files():
+    """Delete every saved file and empty the search index."""
+    await backend.drop()
+    file_generation.bump()
 
-    return files, total_results
 
-async def get_file_details(query):
-    return col.find_one({'file_id': query}) or sec_col.find_one({'file_id': query})
+class MongoBackend(SearchBackend):
+    """Files in the MongoDB file collections, searched through the in-memory index or the tokens array."""
+
+    async def save(self, file):
+        if is_file_already_saved(file['file_id'], file['file_name']):
+            return False
+        # the owner shard first, then the others in order when a database refuses the file (e.g. it is full)
+        for shard in shard_ring.lookup_order(file['file_id']):
+            try:
+                FILE_COLLECTIONS[shard].insert_one(file)
+                file_index.add(file['file_id'], file['file_name'], shard)
+                return True
+            except DuplicateKeyError:
+                print(f"{file['file_name']} is already saved.")
+                return False
+            except Exception as e:
+                print(f"File Database {shard + 1} Could Not Save {file['file_name']}, It May Be Full. Trying The Next File Database. {e}")
+        print(f"No File Database Could Save {file['file_name']}. Add Another File Mongodb Url To FILE_DB_URIS.")
+
+    async def save_many(self, files):
+        # one duplicate lookup per collection for the whole batch instead of up to four per file
+        file_ids = [file['file_id'] for file in files]
+        names = [file['file_name'] for file in files]
+        found = await asyncio.gather(*(
+            collection.find({'$or': [{'file_id': {'$in': file_ids}}, {'file_name': {'$in': names}}]}, {'file_id': 1, 'file_name': 1}).to_list(length=None)
+            for collection in ASYNC_FILE_COLLECTIONS
+        ))
+        seen_ids = {doc['file_id'] for docs in found for doc in docs}
+        seen_names = {doc.get('file_name') for docs in found for doc in docs}
+        pending = []
+        for file in files:
+            if file['file_id'] in seen_ids or file['file_name'] in seen_names:
+                continue
+            # also skips the same file posted twice in one batch
+            seen_ids.add(file['file_id'])
+            seen_names.add(file['file_name'])
+            pending.append(file)
+        saved = []
+        # every file tries its owner shard first; files a database refuses (e.g. it is full) move on to their next shard
+        for attempt in range(len(FILE_COLLECTIONS)):
+            by_shard = {}
+            for file in pending:
+                by_shard.setdefault(shard_ring.lookup_order(file['file_id'])[attempt], []).append(file)
+            pending = []
+            for shard, batch in by_shard.items():
+                failed = set()
+                try:
+                    await ASYNC_FILE_COLLECTIONS[shard].insert_many(batch, ordered=False)
+                except BulkWriteError as e:
+                    # duplicate file_ids saved meanwhile hit the unique index, anything else is retried elsewhere
+                    for error in e.details.get('writeErrors', []):
+                        failed.add(error['index'])
+                        if error['code'] != 11000:
+                            pending.append(batch[error['index']])
+                except Exception as e:
+                    print(f"File Database {shard + 1} Could Not Save {len(batch)} Files, It May Be Full. Trying The Next File Database. {e}")
+                    pending.extend(batch)
+                    continue
+                for index, file in enumerate(batch):
+                    if index not in failed:
+                        file_index.add(file['file_id'], file['file_name'], shard)
+                        saved.append(file)
+            if not pending:
+                break
+        if pending:
+            print(f"No File Database Could Save {len(pending)} Files. Add Another File Mongodb Url To FILE_DB_URIS.")
+        return saved, len(pending)
+
+    async def delete(self, query):
+        # every collection, a file being moved by the rebalancer is briefly in two
+        deleted = 0
+        for collection in FILE_COLLECTIONS:
+            docs = list(collection.find(query, {'file_id': 1}))
+            if not docs:
+                continue
+            result = collection.delete_many({'_id': {'$in': [doc['_id'] for doc in docs]}})
+            for doc in docs:
+                file_index.remove(doc['file_id'])
+            deleted += result.deleted_count
+        return deleted
+
+    async def drop(self):
+        for collection in FILE_COLLECTIONS:
+            collection.drop()
+        file_index.clear()
+
+    async def search(self, queries, max_results, offset, fields=None, projection=None, cursor=None, mode=None):
+        if len(queries) == 1:
+            return await _get_search_results(queries[0], max_results, offset, cursor, mode, fields or {}, projection)
+        return await _get_multi_search_results(queries, max_results, offset, projection)
+
+    async def count(self, query):
+        return await count_flight.do(normalize_query(query), count_all, query_filter(query.strip()))
+
+    async def details(self, file_id):
+        # the index knows the shard of every loaded file; otherwise try the owner shard first
+        doc_id = file_index.doc_ids.get(file_id) if file_index.ready else None
+        shards = [file_index.shards[doc_id]] if doc_id is not None else shard_ring.lookup_order(file_id)
+        for shard in shards:
+            file = FILE_COLLECTIONS[shard].find_one({'file_id': file_id})
+            if file:
+                return file
+        return None
+
+    async def facets(self, query, names):
+        # the in-memory index when it can answer, otherwise one $facet aggregation per file collection
+        hits = file_index.search(query)
+        if hits is not None:
+            return file_index.facets(hits, names)
+        pipeline = [
+            {'$match': query_filter(query)},
+            {'$facet': {
+                name: ([{'$unwind': f'${name}'}] if name == 'languages' else []) + [{'$group': {'_id': f'${name}', 'count': {'$sum': 1}}}]
+                for name in names
+            }}
+        ]
+        results = await asyncio.gather(*(collection.aggregate(pipeline).to_list(length=None) for collection in SEARCH_COLLECTIONS))
+        counts = {name: {} for name in names}
+        for result in results:
+            for name, groups in result[0].items():
+                for group in groups:
+                    if group['_id'] is None:
+                        continue
+                    value = str(group['_id'])
+                    counts[name][value] = counts[name].get(value, 0) + group['count']
+        return counts
+
+
+backend = SqliteBackend(SQLITE_DB_PATH) if SEARCH_BACKEND == 'sqlite' else MongoBackend()
 
 def encode_file_id(s: bytes) -> str:
     r = b""
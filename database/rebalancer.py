@@ -0,0 +1,176 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import time, asyncio, logging
+from pymongo.errors import BulkWriteError
+from info import LOG_CHANNEL, REBALANCE_BATCH_SIZE, REBALANCE_RATE
+from database.ia_filterdb import ASYNC_FILE_COLLECTIONS, shard_ring
+from database.file_index import file_index
+from database.users_chats_db import db
+from TechVJ.util.time_format import get_readable_time
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# Seconds between progress edits of the log channel message
+REPORT_EVERY = 30
+
+
+class Rebalancer:
+    """Background job moving file documents between the file databases.
+
+    A job either moves up to `limit` files from one database to another, or,
+    without a target, moves every file that is not on the database its
+    file_id hashes to, e.g. after a url was appended to FILE_DB_URIS.
+
+    Each batch is copied to the target, the in-memory index is pointed at the
+    copy, and only then deleted from the source, so a search always finds
+    every file in at least one collection. Reads that raced with a batch fall
+    back to the other collections. The checkpoint is saved after every batch,
+    so the job resumes where it stopped after a restart.
+    """
+
+    def __init__(self):
+        self.task = None
+        self.job = None
+        self.cancelled = False
+        self.rate = 0
+
+    @property
+    def running(self):
+        return self.task is not None and not self.task.done()
+
+    async def start(self, bot, source=None, target=None, limit=0):
+        """Start a job; returns False when one is already running."""
+        if self.running:
+            return False
+        sources = [source] if source is not None else list(range(len(ASYNC_FILE_COLLECTIONS)))
+        counts = await asyncio.gather(*(ASYNC_FILE_COLLECTIONS[shard].estimated_document_count() for shard in sources))
+        job = {
+            'sources': sources,
+            'target': target,
+            'limit': limit,
+            'total': min(limit, sum(counts)) if limit else sum(counts),
+            'last_id': None,
+            'moved': 0,
+            'scanned': 0,
+            'started': time.time()
+        }
+        await db.save_rebalance(job)
+        self._spawn(bot, job)
+        return True
+
+    async def resume(self, bot):
+        """Continue a job that was interrupted by a restart."""
+        job = await db.get_rebalance()
+        if job and not self.running:
+            logger.info(f"Resuming file rebalance after {job['moved']} moved files.")
+            self._spawn(bot, job)
+
+    def cancel(self):
+        """Stop the running job after its current batch."""
+        if not self.running:
+            return False
+        self.cancelled = True
+        return True
+
+    def _spawn(self, bot, job):
+        self.job = job
+        self.cancelled = False
+        self.rate = 0
+        self.task = asyncio.create_task(self._run(bot, job))
+
+    async def _run(self, bot, job):
+        report = None
+        status = 'Running'
+        started = time.monotonic()
+        scanned = 0
+        last_report = 0
+        try:
+            while job['sources'] and not self.cancelled:
+                if job['limit'] and job['moved'] >= job['limit']:
+                    break
+                batch_started = time.monotonic()
+                count = await self._move_batch(job)
+                if not count:
+                    job['sources'].pop(0)
+                    job['last_id'] = None
+                await db.save_rebalance(job)
+                scanned += count
+                self.rate = scanned / max(time.monotonic() - started, 0.001)
+                if time.monotonic() - last_report >= REPORT_EVERY:
+                    report = await self._report(bot, report, status)
+                    last_report = time.monotonic()
+                # stay under REBALANCE_RATE files per second
+                await asyncio.sleep(max(0, count / REBALANCE_RATE - (time.monotonic() - batch_started)))
+            status = 'Cancelled' if self.cancelled else 'Completed'
+            await db.delete_rebalance()
+        except Exception as e:
+            # the checkpoint is kept, /rebalance resume continues from the last batch
+            logger.exception(e)
+            status = f'Failed: {e}'
+        await self._report(bot, report, status)
+
+    async def _move_batch(self, job):
+        source = job['sources'][0]
+        collection = ASYNC_FILE_COLLECTIONS[source]
+        size = REBALANCE_BATCH_SIZE
+        if job['limit']:
+            size = min(size, job['limit'] - job['moved'])
+        filter = {'_id': {'$gt': job['last_id']}} if job['last_id'] is not None else {}
+        docs = await collection.find(filter).sort('_id', 1).to_list(length=size)
+        if not docs:
+            return 0
+        groups = {}
+        for doc in docs:
+            target = job['target'] if job['target'] is not None else shard_ring.shard_for(doc['file_id'])
+            if target != source:
+                groups.setdefault(target, []).append(doc)
+        for target, group in groups.items():
+            try:
+                await ASYNC_FILE_COLLECTIONS[target].insert_many(group, ordered=False)
+            except BulkWriteError as e:
+                # files copied before an interrupted batch are duplicates, anything else is a real failure
+                if any(error['code'] != 11000 for error in e.details.get('writeErrors', [])):
+                    raise
+            for doc in group:
+                file_index.add(doc['file_id'], doc.get('file_name', ''), target)
+            await collection.delete_many({'_id': {'$in': [doc['_id'] for doc in group]}})
+            job['moved'] += len(group)
+        job['last_id'] = docs[-1]['_id']
+        job['scanned'] += len(docs)
+        return len(docs)
+
+    def status(self, status='Running'):
+        job = self.job
+        if job is None:
+            return "No rebalance has run since the last restart."
+        if job['target'] is None:
+            route = "every file to the database its file_id hashes to"
+        else:
+            route = f"file database {job['sources'][0] + 1 if job['sources'] else '-'} to {job['target'] + 1}"
+        remaining = max(job['total'] - (job['moved'] if job['limit'] else job['scanned']), 0)
+        eta = get_readable_time(int(remaining / self.rate)) if self.rate and remaining else '-'
+        return (
+            f"<b>File Database Rebalance</b>\n\n"
+            f"Moving: {route}\n"
+            f"Moved: {job['moved']}\n"
+            f"Checked: {job['scanned']} / {job['total']}\n"
+            f"Speed: {self.rate:.0f} files/sec\n"
+            f"ETA: {eta}\n"
+            f"Status: {status}"
+        )
+
+    async def _report(self, bot, message, status):
+        text = self.status(status)
+        try:
+            if message is None:
+                return await bot.send_message(LOG_CHANNEL, text)
+            await message.edit(text)
+        except Exception as e:
+            logger.warning(f"Could not report rebalance progress: {e}")
+        return message
+
+
+rebalancer = Rebalancer()
@@ -0,0 +1,50 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+
+class SearchBackend:
+    """Where saved files live and how they are searched.
+
+    ia_filterdb keeps the public API (save_file, get_search_results,
+    get_file_details, delete_files, ...) and forwards to the backend picked
+    by SEARCH_BACKEND. File documents are plain dicts with file_id,
+    file_name, file_size, caption, tokens and the parsed metadata fields.
+    """
+
+    async def save(self, file):
+        """Store one file document; True when saved, False for a duplicate, None when out of space."""
+        raise NotImplementedError
+
+    async def save_many(self, files):
+        """Store a batch of file documents; returns (the documents that were new, number that failed)."""
+        raise NotImplementedError
+
+    async def delete(self, query):
+        """Delete the files whose fields equal query ({'file_id': ...}) and return the deleted count."""
+        raise NotImplementedError
+
+    async def drop(self):
+        """Delete every file."""
+        raise NotImplementedError
+
+    async def search(self, queries, max_results, offset, fields=None, projection=None, cursor=None, mode=None):
+        """Files matching any of the alternative queries as (files, next_offset, total_results).
+
+        fields must equal the parsed metadata, projection limits the returned
+        fields, cursor resumes after a page and mode picks the ranking.
+        Backends may ignore cursor and mode.
+        """
+        raise NotImplementedError
+
+    async def count(self, query):
+        """Number of files matching query."""
+        raise NotImplementedError
+
+    async def details(self, file_id):
+        """The full document of one file, or None."""
+        raise NotImplementedError
+
+    async def facets(self, query, names):
+        """Files matching query counted per value of the given metadata fields."""
+        raise NotImplementedError
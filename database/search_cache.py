@@ -0,0 +1,94 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import time
+from collections import OrderedDict
+from info import COUNT_CACHE_TIME, SEARCH_CACHE_TIME, SEARCH_CACHE_SIZE, INLINE_CACHE_TIME
+
+
+class FileGeneration:
+    """Counter bumped on every save or delete in the file collections.
+
+    Cached search data remembers the generation it was computed at and is
+    ignored once the collections have changed since. Callers read the value
+    before they start searching and pass it to set(), so a save landing
+    while a search is awaited still invalidates its result.
+    """
+
+    def __init__(self):
+        self.value = 0
+
+    def bump(self):
+        self.value += 1
+
+
+class TTLCache:
+    """Small dict cache whose entries expire after ttl seconds or on a new file generation."""
+
+    def __init__(self, generation, ttl, max_size=10000):
+        self.generation = generation
+        self.ttl = ttl
+        self.max_size = max_size
+        self.data = {}
+
+    def get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        expires, generation, value = entry
+        if generation != self.generation.value or expires < time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def set(self, key, value, generation=None):
+        if key not in self.data and len(self.data) >= self.max_size:
+            # dicts keep insertion order, so this drops the oldest entry
+            del self.data[next(iter(self.data))]
+        self.data[key] = (time.monotonic() + self.ttl, self.generation.value if generation is None else generation, value)
+
+    def clear(self):
+        self.data.clear()
+
+
+class LRUCache(TTLCache):
+    """TTLCache that evicts the least recently used entry and counts hits and misses."""
+
+    def __init__(self, generation, ttl, max_size=1000):
+        super().__init__(generation, ttl, max_size)
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = super().get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.data.move_to_end(key)
+        return value
+
+    def set(self, key, value, generation=None):
+        if key in self.data:
+            self.data.move_to_end(key)
+        elif len(self.data) >= self.max_size:
+            self.data.popitem(last=False)
+        self.data[key] = (time.monotonic() + self.ttl, self.generation.value if generation is None else generation, value)
+
+    def stats(self):
+        total = self.hits + self.misses
+        ratio = (self.hits / total * 100) if total else 0
+        return f"{len(self.data)} entries, {self.hits} hits, {self.misses} misses ({ratio:.1f}% hit rate)"
+
+
+def normalize_query(query):
+    """Cache key form of a search query: lowercase with single spaces."""
+    return ' '.join(str(query).lower().split())
+
+
+file_generation = FileGeneration()
+count_cache = TTLCache(file_generation, COUNT_CACHE_TIME)
+result_cache = LRUCache(file_generation, SEARCH_CACHE_TIME, SEARCH_CACHE_SIZE)
+inline_cache = TTLCache(file_generation, INLINE_CACHE_TIME, 5000)
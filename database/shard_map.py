@@ -0,0 +1,36 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import hashlib
+from bisect import bisect
+
+
+class HashRing:
+    """Consistent hash ring mapping file_ids to file database shards.
+
+    Shard n owns `replicas` points on the ring named after its position in
+    FILE_DB_URIS, so appending a URI only moves the file_ids the new shard
+    takes over (about 1/N of them) and never reshuffles the others.
+    """
+
+    def __init__(self, shards, replicas=160):
+        self.shards = shards
+        ring = sorted((self._hash(f"{shard}:{replica}"), shard) for shard in range(shards) for replica in range(replicas))
+        self.points = [point for point, _ in ring]
+        self.owners = [shard for _, shard in ring]
+
+    @staticmethod
+    def _hash(key):
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], 'big')
+
+    def shard_for(self, file_id):
+        """Return the index of the shard a file_id belongs to."""
+        if self.shards == 1:
+            return 0
+        return self.owners[bisect(self.points, self._hash(file_id)) % len(self.points)]
+
+    def lookup_order(self, file_id):
+        """Shards to look a file_id up in: its owner first, then the rest for files saved before resharding."""
+        owner = self.shard_for(file_id)
+        return [owner] + [shard for shard in range(self.shards) if shard != owner]
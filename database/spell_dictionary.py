@@ -0,0 +1,208 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import os, pickle, asyncio, logging
+from bisect import bisect_left, insort
+from info import SPELL_DICT_PATH
+from database.file_index import tokenize
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# bump when the pickled layout changes so old files are rebuilt
+DICT_VERSION = 1
+
+
+def osa_distance(a, b, limit):
+    """Damerau-Levenshtein distance (adjacent swaps count once), or limit + 1 once it can't stay within limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+    return current[-1]
+
+
+class SpellDictionary:
+    """SymSpell style spelling corrector over the words of saved file names.
+
+    Every word keeps its frequency, and every string left after deleting up
+    to max_distance characters from its first prefix_length characters
+    points back to it. A lookup only generates the deletes of the misspelled
+    word and measures the few words they lead to, so it costs microseconds.
+    The dictionary is pickled to path and loaded from there on restart.
+    """
+
+    def __init__(self, path, max_distance=2, prefix_length=6, min_length=3):
+        self.path = path
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.min_length = min_length
+        self.ready = False
+        self.dirty = False
+        self.saving = False
+        self._pending = []
+        self._reset()
+
+    def _reset(self):
+        self.words = {}          # word -> number of file names using it
+        self.deletes = {}        # delete -> words it was made from
+        self.sorted_words = []   # for prefix checks
+
+    def _edits(self, word):
+        edits = frontier = {word[:self.prefix_length]}
+        for _ in range(self.max_distance):
+            frontier = {edit[:i] + edit[i + 1:] for edit in frontier for i in range(len(edit))}
+            edits = edits | frontier
+        return edits
+
+    def _usable(self, word):
+        return len(word) >= self.min_length and word.isalpha()
+
+    def _add(self, word, sort=True):
+        if word in self.words:
+            self.words[word] += 1
+            return
+        self.words[word] = 1
+        for edit in self._edits(word):
+            self.deletes.setdefault(edit, []).append(word)
+        if sort:
+            insort(self.sorted_words, word)
+
+    def add_text(self, text):
+        """Count the words of a newly saved file name."""
+        words = [word for word in set(tokenize(text)) if self._usable(word)]
+        if not self.ready or self.saving:
+            self._pending.extend(words)
+            return
+        for word in words:
+            self._add(word)
+        self.dirty = True
+
+    def allowed_distance(self, word):
+        """Edits a word of this length may be corrected by: none up to 4 letters, one up to 7."""
+        if len(word) <= 4:
+            return 0
+        if len(word) <= 7:
+            return min(1, self.max_distance)
+        return self.max_distance
+
+    def lookup(self, word):
+        """The closest known word, preferring the smaller distance and then the more common word."""
+        max_distance = self.allowed_distance(word)
+        if word in self.words or not self._usable(word) or not max_distance:
+            return word
+        best, best_distance, best_count = word, max_distance + 1, 0
+        seen = set()
+        for edit in self._edits(word):
+            for candidate in self.deletes.get(edit, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = osa_distance(word, candidate, min(best_distance, max_distance))
+                if distance > max_distance:
+                    continue
+                count = self.words[candidate]
+                if distance < best_distance or (distance == best_distance and count > best_count):
+                    best, best_distance, best_count = candidate, distance, count
+        return best
+
+    def is_prefix(self, word):
+        i = bisect_left(self.sorted_words, word)
+        return i < len(self.sorted_words) and self.sorted_words[i].startswith(word)
+
+    def correct(self, query):
+        """Replace unknown words of a query with their closest known word.
+
+        The last word of a longer query is left alone when it starts a known
+        word, since searches match it as a prefix. Only meant for queries
+        that found nothing as typed, a new title is not a typo.
+        """
+        if not self.ready or not query:
+            return query
+        words = query.split()
+        corrected = []
+        for i, word in enumerate(words):
+            lower = word.lower()
+            if lower in self.words or not self._usable(lower) or (0 < i == len(words) - 1 and self.is_prefix(lower)):
+                corrected.append(word)
+            else:
+                corrected.append(self.lookup(lower))
+        return ' '.join(corrected)
+
+    def _load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                version, max_distance, prefix_length, words, deletes = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+            return False
+        if (version, max_distance, prefix_length) != (DICT_VERSION, self.max_distance, self.prefix_length):
+            return False
+        self.words, self.deletes = words, deletes
+        self.sorted_words = sorted(words)
+        return True
+
+    def _build(self, file_names):
+        for file_name in file_names:
+            for word in set(tokenize(file_name)):
+                if self._usable(word):
+                    self._add(word, sort=False)
+        self.sorted_words = sorted(self.words)
+
+    def _write(self):
+        # replace the old file only once the new one is complete
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'wb') as f:
+            pickle.dump((DICT_VERSION, self.max_distance, self.prefix_length, self.words, self.deletes), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.path)
+
+    async def save(self):
+        """Write the dictionary to path.
+
+        The dicts are pickled in the executor; words of files saved meanwhile
+        are held back like during a build and counted once the file is written.
+        """
+        self.saving = True
+        self.dirty = False
+        try:
+            await asyncio.get_event_loop().run_in_executor(None, self._write)
+        finally:
+            self.saving = False
+            pending, self._pending = self._pending, []
+            for word in pending:
+                self._add(word)
+            self.dirty = self.dirty or bool(pending)
+
+    async def build(self, file_names, save_every=600):
+        """Load the saved dictionary, or build it from file names, then keep the file up to date.
+
+        file_names is only consumed when there is no usable saved dictionary.
+        """
+        loop = asyncio.get_event_loop()
+        fresh = SpellDictionary(self.path, self.max_distance, self.prefix_length, self.min_length)
+        loaded = await loop.run_in_executor(None, fresh._load)
+        if not loaded:
+            await loop.run_in_executor(None, fresh._build, file_names)
+        pending = self._pending
+        self.__dict__.update({key: value for key, value in fresh.__dict__.items() if key in ('words', 'deletes', 'sorted_words')})
+        self._pending = []
+        for word in pending:
+            self._add(word)
+        self.ready = True
+        self.dirty = not loaded or bool(pending)
+        logger.info(f"Spell dictionary {'loaded' if loaded else 'built'} with {len(self.words)} words.")
+        while True:
+            if self.dirty:
+                await self.save()
+            await asyncio.sleep(save_every)
+
+
+spell_dictionary = SpellDictionary(SPELL_DICT_PATH)
@@ -0,0 +1,230 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import re, asyncio, sqlite3, threading, logging
+from database.search_backend import SearchBackend
+from database.file_index import tokenize
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+COLUMNS = ('file_id', 'file_name', 'file_size', 'caption', 'year', 'season', 'episode', 'resolution', 'source', 'codec', 'languages')
+FIELD_COLUMNS = ('year', 'season', 'episode', 'resolution', 'source', 'codec', 'languages')
+DELETE_COLUMNS = ('file_id', 'file_name', 'file_size')
+PHRASE_RE = re.compile(r'"([^"]*)"')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    file_id TEXT NOT NULL UNIQUE,
+    file_name TEXT NOT NULL,
+    file_size INTEGER,
+    caption TEXT,
+    year INTEGER,
+    season INTEGER,
+    episode INTEGER,
+    resolution TEXT,
+    source TEXT,
+    codec TEXT,
+    languages TEXT
+);
+CREATE INDEX IF NOT EXISTS files_file_name ON files(file_name);
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(file_name, content='files', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS files_fts_insert AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, file_name) VALUES (new.id, new.file_name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_fts_delete AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, file_name) VALUES ('delete', old.id, old.file_name);
+END;
+"""
+
+# a file is a duplicate when its file_id or its cleaned name is already saved, like is_file_already_saved
+INSERT = f"""
+INSERT OR IGNORE INTO files({', '.join(COLUMNS)})
+SELECT {', '.join('?' for _ in COLUMNS)}
+WHERE NOT EXISTS (SELECT 1 FROM files WHERE file_name = ?)
+"""
+
+
+def match_expression(query):
+    """FTS5 MATCH text for a search query.
+
+    "Quoted words" become a phrase, other words must all appear and, like
+    the in-memory index, the last word of a longer query may be a prefix.
+    Tokens only hold letters and digits, so quoting them is always safe.
+    """
+    phrases = [tokenize(phrase) for phrase in PHRASE_RE.findall(query)]
+    words = list(dict.fromkeys(tokenize(PHRASE_RE.sub(' ', query))))
+    terms = ['"' + ' '.join(phrase) + '"' for phrase in phrases if phrase]
+    terms += [f'"{word}"' for word in words]
+    if not terms:
+        return None
+    if words and len(terms) > 1:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+class SqliteBackend(SearchBackend):
+    """Files in a local SQLite database, searched through an FTS5 index on file_name.
+
+    The database runs in WAL mode so searches don't wait for writes, and
+    every call runs in a worker thread to keep the event loop free.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = None
+
+    def _connect(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.row_factory = sqlite3.Row
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            self.conn.executescript(SCHEMA)
+            logger.info(f"SQLite file database opened at {self.path}.")
+        return self.conn
+
+    def _locked(self, fn, args):
+        with self.lock:
+            return fn(self._connect(), *args)
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_event_loop().run_in_executor(None, self._locked, fn, args)
+
+    @staticmethod
+    def _row(file):
+        languages = file.get('languages')
+        values = [file.get(column) for column in COLUMNS[:-1]]
+        # padded so one language matches with LIKE '% tamil %'
+        values.append(f" {' '.join(languages)} " if languages else None)
+        return values + [file['file_name']]
+
+    @staticmethod
+    def _document(row):
+        file = dict(row)
+        file['_id'] = file.pop('id')
+        if 'languages' in file:
+            file['languages'] = (file['languages'] or '').split()
+        return file
+
+    @staticmethod
+    def _where(queries, fields):
+        clauses, params = [], []
+        # alternatives without a single word can't match anything
+        matches = [match for match in map(match_expression, queries) if match]
+        joined = bool(matches)
+        if joined:
+            clauses.append('files_fts MATCH ?')
+            params.append(' OR '.join(f'({match})' for match in matches))
+        elif any(query.strip() for query in queries):
+            clauses.append('0')
+        for name, value in (fields or {}).items():
+            if name == 'languages':
+                clauses.append('files.languages LIKE ?')
+                params.append(f"% {value} %")
+            elif name in FIELD_COLUMNS:
+                clauses.append(f'files.{name} = ?')
+                params.append(value)
+        source = ' FROM files_fts JOIN files ON files.id = files_fts.rowid' if joined else ' FROM files'
+        where = (' WHERE ' + ' AND '.join(clauses)) if clauses else ''
+        return source + where, params, joined
+
+    def _save_many(self, conn, files):
+        saved = [file for file in files if conn.execute(INSERT, self._row(file)).rowcount]
+        conn.commit()
+        return saved
+
+    async def save_many(self, files):
+        """Insert a batch of file documents in one transaction; duplicates are ignored."""
+        if not files:
+            return [], 0
+        return await self._run(self._save_many, files), 0
+
+    async def save(self, file):
+        saved, _ = await self.save_many([file])
+        if saved:
+            return True
+        print(f"{file['file_name']} is already saved.")
+        return False
+
+    def _delete(self, conn, query):
+        names = [name for name in query if name in DELETE_COLUMNS]
+        if not names or len(names) != len(query):
+            return 0
+        cursor = conn.execute(
+            'DELETE FROM files WHERE ' + ' AND '.join(f'{name} = ?' for name in names),
+            [query[name] for name in names]
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    async def delete(self, query):
+        return await self._run(self._delete, query)
+
+    def _drop(self, conn):
+        conn.execute('DELETE FROM files')
+        conn.commit()
+
+    async def drop(self):
+        await self._run(self._drop)
+
+    def _search(self, conn, queries, max_results, offset, fields, projection, mode):
+        source, params, joined = self._where(queries, fields)
+        total_results = conn.execute('SELECT count(*)' + source, params).fetchone()[0]
+        columns = [column for column in COLUMNS if not projection or column in projection]
+        order = 'files_fts.rank' if joined and mode == 'bm25' else 'files.id DESC'
+        rows = conn.execute(
+            f"SELECT files.id, {', '.join('files.' + column for column in columns)}{source} ORDER BY {order} LIMIT ? OFFSET ?",
+            params + [max_results or -1, offset]
+        ).fetchall()
+        files = [self._document(row) for row in rows]
+        next_offset = "" if not max_results or (offset + max_results) >= total_results else (offset + max_results)
+        return files, next_offset, total_results
+
+    async def search(self, queries, max_results, offset, fields=None, projection=None, cursor=None, mode=None):
+        return await self._run(self._search, queries, max_results, offset, fields, projection, mode)
+
+    def file_names(self):
+        """Every saved file name, read on its own connection so saves aren't held up."""
+        with self.lock:
+            self._connect()
+        conn = sqlite3.connect(self.path)
+        try:
+            for (file_name,) in conn.execute('SELECT file_name FROM files'):
+                yield file_name
+        finally:
+            conn.close()
+
+    def _count(self, conn, query):
+        source, params, _ = self._where([query], None)
+        return conn.execute('SELECT count(*)' + source, params).fetchone()[0]
+
+    async def count(self, query):
+        return await self._run(self._count, query)
+
+    def _details(self, conn, file_id):
+        row = conn.execute(f"SELECT id, {', '.join(COLUMNS)} FROM files WHERE file_id = ?", (file_id,)).fetchone()
+        return self._document(row) if row else None
+
+    async def details(self, file_id):
+        return await self._run(self._details, file_id)
+
+    def _facets(self, conn, query, names):
+        source, params, _ = self._where([query], None)
+        counts = {name: {} for name in names}
+        for name in names:
+            if name not in FIELD_COLUMNS:
+                continue
+            rows = conn.execute(f'SELECT files.{name}, count(*){source} GROUP BY files.{name}', params).fetchall()
+            for value, count in rows:
+                if value is None:
+                    continue
+                for item in (value.split() if name == 'languages' else [value]):
+                    counts[name][str(item)] = counts[name].get(str(item), 0) + count
+        return counts
+
+    async def facets(self, query, names):
+        return await self._run(self._facets, query, names)
@@ -0,0 +1,172 @@
+# Don't Remove Credit @VJ_Bots
+# Subscribe YouTube Channel For Amazing Bot @Tech_VJ
+# Ask Doubt on telegram @KingVJ01
+
+import math, asyncio, logging
+import numpy as np
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+NGRAM = 3
+# new titles are scored one by one until this many wait, then merged into the matrix
+MERGE_AT = 500
+
+
+def char_ngrams(title):
+    """Counts of the character n-grams of a title, padded so word starts and ends count too."""
+    padded = f" {title} "
+    return Counter(padded[i:i + NGRAM] for i in range(len(padded) - NGRAM + 1))
+
+
+class TitleMatcher:
+    """Closest saved titles to a query, by cosine similarity of character n-gram TF-IDF vectors.
+
+    The title matrix is kept column-wise as flat numpy arrays: for every
+    n-gram the rows of the titles holding it and their weights. A query only
+    reads the columns of its own n-grams and np.bincount scores every title
+    at once. Titles added after the last merge are scored directly and
+    merged in bulk in a worker thread; title norms use the idf of the merge
+    that added them.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.titles = []     # row -> title
+        self.rows = {}       # title -> row
+        self.grams = {}      # n-gram -> column
+        self.df = []         # column -> number of titles holding the n-gram
+        self.col_ptr = np.zeros(1, dtype=np.int64)
+        self.col_rows = np.zeros(0, dtype=np.int32)
+        self.col_weights = np.zeros(0, dtype=np.float32)
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.pending = []    # (row, n-gram counts) not merged yet
+        self._merging = None
+
+    def __len__(self):
+        return len(self.titles)
+
+    def add(self, title, merge=True):
+        """Add a distinct title; returns False when it was already known."""
+        if not title or title in self.rows:
+            return False
+        row = self.rows[title] = len(self.titles)
+        self.titles.append(title)
+        counts = char_ngrams(title)
+        for gram in counts:
+            column = self.grams.get(gram)
+            if column is None:
+                column = self.grams[gram] = len(self.df)
+                self.df.append(0)
+            self.df[column] += 1
+        self.pending.append((row, counts))
+        if merge and len(self.pending) >= MERGE_AT and self._merging is None:
+            self._merging = asyncio.get_event_loop().create_task(self.merge_async())
+        return True
+
+    def _idf(self):
+        df = np.asarray(self.df, dtype=np.float32)
+        return np.log((1 + len(self.titles)) / (1 + df)) + 1
+
+    def merge(self):
+        """Fold the pending titles into the column arrays and recompute norms."""
+        if not self.pending:
+            return
+        self.col_rows, self.col_weights, self.col_ptr, self.norms = self._merged(self.pending, self.df, len(self.titles))
+        self.pending = []
+
+    async def merge_async(self):
+        """Like merge, in a worker thread; titles added meanwhile stay pending and searchable."""
+        try:
+            pending, df, total, col_ptr = list(self.pending), list(self.df), len(self.titles), self.col_ptr
+            merged = await asyncio.get_event_loop().run_in_executor(None, self._merged, pending, df, total)
+            # a rebuild replaced the matrix meanwhile
+            if self.col_ptr is col_ptr:
+                self.col_rows, self.col_weights, self.col_ptr, self.norms = merged
+                self.pending = self.pending[len(pending):]
+        finally:
+            if self._merging is asyncio.current_task():
+                self._merging = None
+
+    def _merged(self, pending, df, total):
+        # only reads the current arrays, so it can run while the event loop adds titles
+        idf = np.log((1 + total) / (1 + np.asarray(df, dtype=np.float32))) + 1
+        old_columns = np.repeat(np.arange(len(self.col_ptr) - 1, dtype=np.int32), np.diff(self.col_ptr))
+        new_rows, new_columns, new_tf = [], [], []
+        for row, counts in pending:
+            for gram, tf in counts.items():
+                new_rows.append(row)
+                new_columns.append(self.grams[gram])
+                new_tf.append(tf)
+        new_columns = np.asarray(new_columns, dtype=np.int32)
+        new_weights = ((1 + np.log(np.asarray(new_tf, dtype=np.float32))) * idf[new_columns]).astype(np.float32)
+        rows = np.concatenate([self.col_rows, np.asarray(new_rows, dtype=np.int32)])
+        columns = np.concatenate([old_columns, new_columns])
+        weights = np.concatenate([self.col_weights, new_weights])
+        order = np.argsort(columns, kind='stable')
+        col_ptr = np.concatenate([[0], np.cumsum(np.bincount(columns, minlength=len(df)))]).astype(np.int64)
+        norms = np.sqrt(np.bincount(rows, weights=weights.astype(np.float64) ** 2, minlength=total)).astype(np.float32)
+        return rows[order], weights[order], col_ptr, norms
+
+    def match(self, query, k=10, min_score=0.3):
+        """Return up to k (title, score) pairs, best first."""
+        counts = char_ngrams(query)
+        if not counts or not self.titles:
+            return []
+        idf = self._idf()
+        unknown = math.log(1 + len(self.titles)) + 1
+        query_weights = {}
+        query_norm = 0.0
+        for gram, tf in counts.items():
+            column = self.grams.get(gram)
+            weight = (1 + math.log(tf)) * (idf[column] if column is not None else unknown)
+            query_norm += weight * weight
+            if column is not None:
+                query_weights[column] = weight
+        if not query_weights:
+            return []
+        query_norm = math.sqrt(query_norm)
+        scores = np.zeros(len(self.titles), dtype=np.float32)
+        merged = [column for column in query_weights if column < len(self.col_ptr) - 1]
+        if merged:
+            spans = [np.arange(self.col_ptr[column], self.col_ptr[column + 1]) for column in merged]
+            factors = np.concatenate([np.full(len(span), query_weights[column], dtype=np.float32) for span, column in zip(spans, merged)])
+            spans = np.concatenate(spans)
+            dots = np.bincount(self.col_rows[spans], weights=self.col_weights[spans] * factors, minlength=len(self.titles))
+            norms = np.ones(len(self.titles), dtype=np.float32)
+            norms[:len(self.norms)] = np.maximum(self.norms, 1e-6)
+            scores = (dots / norms).astype(np.float32)
+        for row, title_counts in self.pending:
+            dot = norm = 0.0
+            for gram, tf in title_counts.items():
+                column = self.grams[gram]
+                weight = (1 + math.log(tf)) * idf[column]
+                norm += weight * weight
+                dot += weight * query_weights.get(column, 0.0)
+            scores[row] = dot / math.sqrt(norm) if norm else 0.0
+        scores /= query_norm
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [(self.titles[row], float(scores[row])) for row in top if scores[row] >= min_score]
+
+    def _load(self, file_names):
+        for file_name in file_names:
+            self.add(file_name, merge=False)
+        self.merge()
+
+    async def build(self, file_names):
+        """Load the distinct titles of an iterable of titles in a worker thread."""
+        fresh = TitleMatcher()
+        await asyncio.get_event_loop().run_in_executor(None, fresh._load, file_names)
+        # titles saved while loading may be missing from the snapshot
+        added = list(self.titles)
+        self.__dict__.update(fresh.__dict__)
+        for title in added:
+            self.add(title)
+        self.ready = True
+        logger.info(f"Title matcher built with {len(self)} titles and {len(self.grams)} n-grams.")
+
+
+title_matcher = TitleMatcher()
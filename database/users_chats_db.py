@@ -66,6 +66,7 @@ class Database:
         self.grp = self.db.groups
         self.users = self.db.uersz
         self.bot = self.db.clone_bots
+        self.jobs = self.db.jobs
 
 
     def new_user(self, id, name):
@@ -306,6 +307,15 @@ class Database:
     async def get_save(self, id):
         user = await self.col.find_one({'id': int(id)})
         return user.get('save', False) 
+
+    async def get_rebalance(self):
+        return await self.jobs.find_one({'_id': 'rebalance'})
+
+    async def save_rebalance(self, job):
+        await self.jobs.replace_one({'_id': 'rebalance'}, {**job, '_id': 'rebalance'}, upsert=True)
+
+    async def delete_rebalance(self):
+        await self.jobs.delete_one({'_id': 'rebalance'})
     
 
 db = Database(USER_DB_URI, DATABASE_NAME)
@@ -14,6 +14,7 @@ from datetime import datetime, date
 from typing import List
 from database.users_chats_db import db
 from database.join_reqs import JoinReqs
+from database.ia_filterdb import get_file_details
 from bs4 import BeautifulSoup
 from shortzy import Shortzy
 
@@ -593,7 +594,8 @@ async def send_all(bot, userid, files, ident, chat_id, user_name, query):
                     await bot.send_message(chat_id=userid, text=f"<b>Hᴇʏ ᴛʜᴇʀᴇ {user_name} 👋🏽 \n\n✅ Sᴇᴄᴜʀᴇ ʟɪɴᴋ ᴛᴏ ʏᴏᴜʀ ғɪʟᴇ ʜᴀs sᴜᴄᴄᴇssғᴜʟʟʏ ʙᴇᴇɴ ɢᴇɴᴇʀᴀᴛᴇᴅ ᴘʟᴇᴀsᴇ ᴄʟɪᴄᴋ ᴅᴏᴡɴʟᴏᴀᴅ ʙᴜᴛᴛᴏɴ\n\n🗃️ Fɪʟᴇ Nᴀᴍᴇ : {title}\n🔖 Fɪʟᴇ Sɪᴢᴇ : {size}</b>", reply_markup=InlineKeyboardMarkup([[InlineKeyboardButton("📤 Dᴏᴡɴʟᴏᴀᴅ 📥", url=await get_shortlink(chat_id, f"https://telegram.me/{temp.U_NAME}?start=files_{file['file_id']}"))]]))
         else:
             for file in files:
-                f_caption = file["caption"]
+                # search pages are loaded without captions, fetch it only for the file being sent
+                f_caption = file["caption"] if "caption" in file else (await get_file_details(file["file_id"]) or {}).get("caption")
                 title = file["file_name"]
                 size = get_size(file["file_size"])
                 if CUSTOM_FILE_CAPTION:
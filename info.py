@@ -133,6 +133,21 @@ TUTORIAL = environ.get('TUTORIAL', '') # How Open Shortner Link Video Link , Cha
 
 # Others
 CACHE_TIME = int(environ.get('CACHE_TIME', 1800))
+COUNT_CACHE_TIME = int(environ.get('COUNT_CACHE_TIME', 300)) # Seconds a search total is reused for the next pages
+SEARCH_CACHE_TIME = int(environ.get('SEARCH_CACHE_TIME', 120)) # Seconds a search result page is served from memory
+SEARCH_CACHE_SIZE = int(environ.get('SEARCH_CACHE_SIZE', 1000)) # Max search result pages kept in memory
+INLINE_CACHE_TIME = int(environ.get('INLINE_CACHE_TIME', 30)) # Seconds a user's inline results are reused while they keep typing
+SEARCH_BACKEND = environ.get('SEARCH_BACKEND', 'mongodb') # mongodb = file collections in the file database urls, sqlite = local SQLite FTS5 database at SQLITE_DB_PATH
+SQLITE_DB_PATH = environ.get('SQLITE_DB_PATH', 'files.db')
+REBALANCE_BATCH_SIZE = int(environ.get('REBALANCE_BATCH_SIZE', 500)) # Files moved per batch by /rebalance
+REBALANCE_RATE = int(environ.get('REBALANCE_RATE', 1000)) # Max files per second /rebalance reads, so searches keep their speed
+HOT_QUERY_WINDOW = int(environ.get('HOT_QUERY_WINDOW', 3600)) # Seconds of searches counted to find the most searched queries
+HOT_QUERY_COUNT = int(environ.get('HOT_QUERY_COUNT', 50)) # Most searched queries whose first page is kept ready in memory, 0 = off
+HOT_QUERY_REFRESH = int(environ.get('HOT_QUERY_REFRESH', 30)) # Seconds between refreshes of those pages
+INDEX_BATCH_SIZE = int(environ.get('INDEX_BATCH_SIZE', 500)) # Files saved together in one insert while indexing a channel
+INDEX_FLUSH_TIME = int(environ.get('INDEX_FLUSH_TIME', 5)) # Max seconds indexed files wait before their batch is saved
+SPELL_DICT_PATH = environ.get('SPELL_DICT_PATH', 'spell_dictionary.pickle') # Where the spelling dictionary built from file names is kept between restarts
+SEARCH_MODE = environ.get('SEARCH_MODE', 'token') # token = whole words newest first, fuzzy = trigram match that tolerates typos and partial words, bm25 = best match first (fuzzy and bm25 use more memory)
 MAX_B_TN = environ.get("MAX_B_TN", "5")
 PORT = environ.get("PORT", "8080")
 MSG_ALRT = environ.get('MSG_ALRT', 'Hello My Dear Friends ❤️')
@@ -142,6 +157,14 @@ IMDB_TEMPLATE = environ.get("IMDB_TEMPLATE", f"{script.IMDB_TEMPLATE_TXT}")
 MAX_LIST_ELM = environ.get("MAX_LIST_ELM", None)
 
 
+# Words Dropped From Search Queries, Per Language (Give Space Separated Words To Replace A List)
+STOP_WORDS = {
+    'english': environ.get('EN_STOP_WORDS', 'in upload series full horror thriller mystery print file new latest that find dubbed link film movie movies anyone').split(),
+    'tamil': environ.get('TA_STOP_WORDS', 'venum iruka pannunga pannungga anuppunga anupunga anuppungga anupungga').split(),
+    'malayalam': environ.get('ML_STOP_WORDS', 'undo kitti kitty kittumo kittum tharu tharo ayakko ayakkumo').split(),
+}
+
+
 # Choose Option Settings 
 LANGUAGES = ["malayalam", "mal", "tamil", "tam" ,"english", "eng", "hindi", "hin", "telugu", "tel", "kannada", "kan"]
 SEASONS = ["season 1", "season 2", "season 3", "season 4", "season 5", "season 6", "season 7", "season 8", "season 9", "season 10"]
@@ -192,6 +215,14 @@ else:
     FILE_DB_URI = F_DB_URI        # This Db Is For File Data Store
     SEC_FILE_DB_URI = S_DB_URI    # This Db is for File Data Store When First Db Is Going To Be Full.
 
+# Space separated file database urls, new files are spread over all of them by file_id. Only ever append a url, never remove or reorder.
+FILE_DB_URIS = environ.get('FILE_DB_URIS', '').split() or ([FILE_DB_URI, SEC_FILE_DB_URI] if MULTIPLE_DATABASE else [FILE_DB_URI])
+FILE_READ_URIS = environ.get('FILE_READ_URIS', '').split() or FILE_DB_URIS # Optional separate urls searches read from (e.g. a read replica), one per FILE_DB_URIS url in the same order
+READ_PREFERENCE = environ.get('READ_PREFERENCE', 'primary') # Where searches read: primary, primaryPreferred, secondary, secondaryPreferred or nearest. Saving always uses the primary
+MAX_STALENESS = int(environ.get('MAX_STALENESS', 0)) # Seconds a secondary may lag behind before searches skip it, 0 = no limit (MongoDB needs at least 90)
+READ_POOL_SIZE = int(environ.get('READ_POOL_SIZE', 100)) # Connections per file database for searches
+WRITE_POOL_SIZE = int(environ.get('WRITE_POOL_SIZE', 100)) # Connections per file database for saving and moving files
+
 
 # Don't Remove Credit @VJ_Bots
 # Subscribe YouTube Channel For Amazing Bot @Tech_VJ
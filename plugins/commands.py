@@ -7,10 +7,14 @@ from Script import script
 from pyrogram import Client, filters, enums
 from pyrogram.errors import ChatAdminRequired, FloodWait
 from pyrogram.types import *
-from database.ia_filterdb import col, sec_col, get_file_details, unpack_new_file_id, get_bad_files
+from database.ia_filterdb import get_file_details, unpack_new_file_id, get_bad_files, delete_files, delete_all_files, FILE_COLLECTIONS
+from database.rebalancer import rebalancer
+from database.search_cache import result_cache
+from database.hot_queries import hot_queries
+from utils.singleflight import singleflight_stats
 from database.users_chats_db import db, delete_all_referal_users, get_referal_users_count, get_referal_all_users, referal_add_user
 from database.join_reqs import JoinReqs
-from info import CLONE_MODE, OWNER_LNK, REACTIONS, CHANNELS, REQUEST_TO_JOIN_MODE, TRY_AGAIN_BTN, ADMINS, SHORTLINK_MODE, PREMIUM_AND_REFERAL_MODE, STREAM_MODE, AUTH_CHANNEL, REFERAL_PREMEIUM_TIME, REFERAL_COUNT, PAYMENT_TEXT, PAYMENT_QR, LOG_CHANNEL, PICS, BATCH_FILE_CAPTION, CUSTOM_FILE_CAPTION, PROTECT_CONTENT, CHNL_LNK, GRP_LNK, REQST_CHANNEL, SUPPORT_CHAT, MAX_B_TN, VERIFY, SHORTLINK_API, SHORTLINK_URL, TUTORIAL, VERIFY_TUTORIAL, IS_TUTORIAL, URL
+from info import SEARCH_BACKEND, CLONE_MODE, OWNER_LNK, REACTIONS, CHANNELS, REQUEST_TO_JOIN_MODE, TRY_AGAIN_BTN, ADMINS, SHORTLINK_MODE, PREMIUM_AND_REFERAL_MODE, STREAM_MODE, AUTH_CHANNEL, REFERAL_PREMEIUM_TIME, REFERAL_COUNT, PAYMENT_TEXT, PAYMENT_QR, LOG_CHANNEL, PICS, BATCH_FILE_CAPTION, CUSTOM_FILE_CAPTION, PROTECT_CONTENT, CHNL_LNK, GRP_LNK, REQST_CHANNEL, SUPPORT_CHAT, MAX_B_TN, VERIFY, SHORTLINK_API, SHORTLINK_URL, TUTORIAL, VERIFY_TUTORIAL, IS_TUTORIAL, URL
 from helper import get_settings, pub_is_subscribed, get_size, is_subscribed, save_group_settings, temp, verify_user, check_token, check_verification, get_token, get_shortlink, get_tutorial, get_seconds
 from database.connections_mdb import active_connection
 from urllib.parse import quote_plus
@@ -632,6 +636,43 @@ async def log_file(bot, message):
     except Exception as e:
         await message.reply(str(e))
 
+@Client.on_message(filters.command('searchstats') & filters.user(ADMINS))
+async def search_stats(bot, message):
+    await message.reply(f"<b>Search Result Cache</b>\n{result_cache.stats()}\n\n<b>Most Searched</b>\n{hot_queries.stats()}\n\n<b>Shared Calls</b>\n{singleflight_stats()}")
+
+@Client.on_message(filters.command('rebalance') & filters.user(ADMINS))
+async def rebalance_files(bot, message):
+    usage = ("<b>Usage:</b>\n"
+             "/rebalance - move every file to the database its file_id belongs to, run it after adding a url to FILE_DB_URIS\n"
+             "/rebalance 1 2 50000 - move 50000 files from file database 1 to 2, leave the count out to move all\n"
+             "/rebalance status | cancel | resume")
+    if SEARCH_BACKEND == 'sqlite' or len(FILE_COLLECTIONS) < 2:
+        return await message.reply("Rebalancing needs at least two file database urls in FILE_DB_URIS.")
+    args = message.command[1:]
+    if args and args[0] == 'status':
+        return await message.reply(rebalancer.status('Running' if rebalancer.running else 'Stopped'))
+    if args and args[0] == 'cancel':
+        if rebalancer.cancel():
+            return await message.reply("Rebalance will stop after the current batch.")
+        return await message.reply("No rebalance is running.")
+    if args and args[0] == 'resume':
+        await rebalancer.resume(bot)
+        return await message.reply("Resumed the saved rebalance." if rebalancer.running else "There is no saved rebalance to resume.")
+    source = target = None
+    limit = 0
+    if args:
+        try:
+            source, target = int(args[0]) - 1, int(args[1]) - 1
+            limit = int(args[2]) if len(args) > 2 else 0
+        except (ValueError, IndexError):
+            return await message.reply(usage)
+        shards = range(len(FILE_COLLECTIONS))
+        if source not in shards or target not in shards or source == target or limit < 0:
+            return await message.reply(usage)
+    if not await rebalancer.start(bot, source, target, limit):
+        return await message.reply("A rebalance is already running, check it with /rebalance status.")
+    await message.reply("Rebalance started, progress is reported in the log channel.")
+
 @Client.on_message(filters.command('delete') & filters.user(ADMINS))
 async def delete(bot, message):
     reply = await bot.ask(message.from_user.id, "Now Send Me Media Which You Want to delete")
@@ -649,16 +690,12 @@ async def delete(bot, message):
         await msg.edit('This is not supported file format')
         return
     
-    file_id, file_ref = unpack_new_file_id(media.file_id)
+    file_id = unpack_new_file_id(media.file_id)
 
-    result = col.delete_one({
+    deleted = await delete_files({
         'file_id': file_id,
     })
-    if not result.deleted_count:
-        result = sec_col.delete_one({
-            'file_id': file_id,
-        })
-    if result.deleted_count:
+    if deleted:
         await msg.edit('File is successfully deleted from database')
     else:
         file_name = re.sub(r"(_|\-|\.|\+)", " ", str(media.file_name))
@@ -667,30 +704,20 @@ async def delete(bot, message):
             file_name = file_name.replace(char, '')
         file_name = ' '.join(filter(lambda x: not x.startswith('@'), file_name.split()))
     
-        result = col.delete_many({
+        deleted = await delete_files({
             'file_name': file_name,
             'file_size': media.file_size
         })
-        if not result.deleted_count:
-            result = sec_col.delete_many({
-                'file_name': file_name,
-                'file_size': media.file_size
-            })
-        if result.deleted_count:
+        if deleted:
             await msg.edit('File is successfully deleted from database')
         else:
             # files indexed before https://github.com/EvamariaTG/EvaMaria/commit/f3d2a1bcb155faf44178e5d7a685a1b533e714bf#diff-86b613edf1748372103e94cacff3b578b36b698ef9c16817bb98fe9ef22fb669R39 
             # have original file name.
-            result = col.delete_many({
+            deleted = await delete_files({
                 'file_name': media.file_name,
                 'file_size': media.file_size
             })
-            if not result.deleted_count:
-                result = sec_col.delete_many({
-                    'file_name': media.file_name,
-                    'file_size': media.file_size
-                })
-            if result.deleted_count:
+            if deleted:
                 await msg.edit('File is successfully deleted from database')
             else:
                 await msg.edit('File not found in database')
@@ -713,8 +740,7 @@ async def delete_all_index(bot, message):
 
 @Client.on_callback_query(filters.regex(r'^autofilter_delete'))
 async def delete_all_index_confirm(bot, query):
-    col.drop()
-    sec_col.drop()
+    await delete_all_files()
     await query.answer('Piracy Is Crime')
     await query.message.edit('Succesfully Deleted All The Indexed Files.')
 
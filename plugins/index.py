@@ -2,15 +2,16 @@
 # Subscribe YouTube Channel For Amazing Bot @Tech_VJ
 # Ask Doubt on telegram @KingVJ01
 
-import logging, re, asyncio
+import logging, re, asyncio, time
 from helper import temp
-from info import ADMINS
+from info import ADMINS, INDEX_BATCH_SIZE, INDEX_FLUSH_TIME
 from pyrogram import Client, filters, enums
 from pyrogram.errors import FloodWait, MessageNotModified
 from pyrogram.errors.exceptions.bad_request_400 import ChannelInvalid, ChatAdminRequired, UsernameInvalid, UsernameNotModified
 from info import INDEX_REQ_CHANNEL as LOG_CHANNEL
-from database.ia_filterdb import save_file
+from database.ia_filterdb import file_document, save_files
 from pyrogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+from TechVJ.bot.clients import iter_messages_parallel
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -142,12 +143,54 @@ async def index_files_to_db(lst_msg_id, chat, msg, bot):
     deleted = 0
     no_media = 0
     unsupported = 0
+    # parsed files wait in batch, full batches go through a bounded queue to the saver,
+    # so the next messages are fetched and parsed while a batch is being written
+    batch = []
+    saves = asyncio.Queue(maxsize=2)
+    last_flush = time.monotonic()
+    speed = ""
+
+    async def saver():
+        nonlocal total_files, duplicate, errors, speed
+        while True:
+            files = await saves.get()
+            if files is None:
+                return
+            started = time.monotonic()
+            try:
+                saved, duplicates, failed = await save_files(files)
+            except Exception as e:
+                logger.exception(e)
+                saved, duplicates, failed = 0, 0, len(files)
+            took = time.monotonic() - started
+            total_files += saved
+            duplicate += duplicates
+            errors += failed
+            speed = f"\nLast batch: <code>{len(files)}</code> files in <code>{took:.2f}s</code> ({len(files) / max(took, 0.001):.0f} files/sec)"
+
+    async def flush():
+        nonlocal batch, last_flush
+        if batch:
+            await saves.put(batch)
+            batch = []
+        last_flush = time.monotonic()
+
+    async def finish():
+        # hand over what is left and wait until the saver wrote everything
+        await flush()
+        await saves.put(None)
+        await saving
+
     async with lock:
+        saving = asyncio.create_task(saver())
         try:
             current = temp.CURRENT
             temp.CANCEL = False
-            async for message in bot.iter_messages(chat, lst_msg_id, temp.CURRENT):
+            async for message in iter_messages_parallel(chat, lst_msg_id, temp.CURRENT):
+                if len(batch) >= INDEX_BATCH_SIZE or time.monotonic() - last_flush >= INDEX_FLUSH_TIME:
+                    await flush()
                 if temp.CANCEL:
+                    await finish()
                     await msg.edit(f"Successfully Cancelled!!\n\nSaved <code>{total_files}</code> files to dataBase!\nDuplicate Files Skipped: <code>{duplicate}</code>\nDeleted Messages Skipped: <code>{deleted}</code>\nNon-Media messages skipped: <code>{no_media + unsupported}</code>(Unsupported Media - `{unsupported}` )\nErrors Occurred: <code>{errors}</code>")
                     break
                 current += 1
@@ -156,7 +199,7 @@ async def index_files_to_db(lst_msg_id, chat, msg, bot):
                     reply = InlineKeyboardMarkup(can)
                     try:
                         await msg.edit_text(
-                            text=f"Total messages fetched: <code>{current}</code>\nTotal messages saved: <code>{total_files}</code>\nDuplicate Files Skipped: <code>{duplicate}</code>\nDeleted Messages Skipped: <code>{deleted}</code>\nNon-Media messages skipped: <code>{no_media + unsupported}</code>(Unsupported Media - `{unsupported}` )\nErrors Occurred: <code>{errors}</code>",
+                            text=f"Total messages fetched: <code>{current}</code>\nTotal messages saved: <code>{total_files}</code>\nDuplicate Files Skipped: <code>{duplicate}</code>\nDeleted Messages Skipped: <code>{deleted}</code>\nNon-Media messages skipped: <code>{no_media + unsupported}</code>(Unsupported Media - `{unsupported}` )\nErrors Occurred: <code>{errors}</code>{speed}",
                             reply_markup=reply
                         )
                     except MessageNotModified:
@@ -175,15 +218,14 @@ async def index_files_to_db(lst_msg_id, chat, msg, bot):
                     unsupported += 1
                     continue
                 media.caption = message.caption
-                aynav, vnay = await save_file(media)
-                if aynav:
-                    total_files += 1
-                elif vnay == 0:
-                    duplicate += 1
-                elif vnay == 2:
-                    errors += 1
+                batch.append(file_document(media))
+            else:
+                await finish()
         except Exception as e:
             logger.exception(e)
+            if not saving.done():
+                # keep the files read before the error
+                await finish()
             k = await msg.edit(f'Error: {e}')
             await k.reply_text(f'Succesfully saved <code>{total_files}</code> to dataBase!\nDuplicate Files Skipped: <code>{duplicate}</code>\nDeleted Messages Skipped: <code>{deleted}</code>\nNon-Media messages skipped: <code>{no_media + unsupported}</code>(Unsupported Media - `{unsupported}` )\nErrors Occurred: <code>{errors}</code>')
             await k.reply_text("**If You Get Message Not Modified Error Then Skip Your Saved File Then Index Again**")
@@ -6,10 +6,11 @@ import logging
 from pyrogram import Client, emoji, filters
 from pyrogram.errors.exceptions.bad_request_400 import QueryIdInvalid
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, InlineQueryResultCachedDocument, InlineQuery
-from database.ia_filterdb import get_search_results
+from database.ia_filterdb import get_inline_results, DISPLAY_FIELDS
+from database.hot_queries import hot_queries, inline_caption
 from helper import is_subscribed, get_size, temp
-from info import CACHE_TIME, AUTH_USERS, AUTH_CHANNEL, CUSTOM_FILE_CAPTION
-from database.connections_mdb import active_connection
+from utils.query_normalizer import search_normalizer
+from info import CACHE_TIME, AUTH_USERS, AUTH_CHANNEL
 
 logger = logging.getLogger(__name__)
 cache_time = 0 if AUTH_USERS or AUTH_CHANNEL else CACHE_TIME
@@ -27,7 +28,6 @@ async def inline_users(query: InlineQuery):
 @Client.on_inline_query()
 async def answer(bot, query):
     """Show search results for given inline query"""
-    chat_id = await active_connection(str(query.from_user.id))
     
     if not await inline_users(query):
         await query.answer(
@@ -58,20 +58,18 @@ async def answer(bot, query):
 
     offset = int(query.offset or 0)
     reply_markup = get_reply_markup(query=string)
-    files, next_offset, total = await get_search_results(chat_id, string, file_type=file_type, max_results=10, offset=offset)
-
-    for file in files:
-        title=file['file_name']
-        size=get_size(file['file_size'])
-        f_caption=file['caption']
-        if CUSTOM_FILE_CAPTION:
-            try:
-                f_caption=CUSTOM_FILE_CAPTION.format(file_name= '' if title is None else title, file_size='' if size is None else size, file_caption='' if f_caption is None else f_caption)
-            except Exception as e:
-                logger.exception(e)
-                f_caption=f_caption
-        if f_caption is None:
-            f_caption = f"{file['file_name']}"
+    search = search_normalizer.normalize(string) or string
+    warm = None
+    if not offset:
+        hot_queries.record('inline', search)
+        warm = hot_queries.get('inline', search)
+    if warm:
+        files, next_offset, total, captions = warm
+    else:
+        files, next_offset, total = await get_inline_results(query.from_user.id, search, max_results=10, offset=offset, projection=DISPLAY_FIELDS + ('caption',))
+        captions = [inline_caption(file) for file in files]
+
+    for file, f_caption in zip(files, captions):
         results.append(
             InlineQueryResultCachedDocument(
                 title=file['file_name'],
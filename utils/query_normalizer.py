@@ -0,0 +1,44 @@
+import re
+from functools import lru_cache
+from info import STOP_WORDS, LANGUAGES
+
+# Word families that are easier to catch with a pattern than to list one by one
+NOISE_RE = re.compile(
+    r"\b(?:"
+    r"pl(?:i|e)*?(?:s|z+|ease|se|ese|e+se?)"  # please, pls, plz, plis
+    r"|(?:send|snd|give?|gib)(?:\sme)?"        # send me, give, gib
+    r"|h(?:e|a)?l+o+"                          # hello, helo, hlo
+    r"|br(?:o|u)+h?"                           # bro, bruh, broh
+    r"|with\ssubtitles?"
+    r")\b",
+    flags=re.IGNORECASE
+)
+PUNCT_RE = re.compile(r"[:.]")
+
+
+class QueryNormalizer:
+    """Turn a raw chat message into the query that is actually searched.
+
+    Stop words are dropped as whole words using a frozenset, the word
+    families above are removed with one precompiled pattern, and the result
+    for repeated messages comes from a bounded memo cache.
+    """
+
+    def __init__(self, stop_words, extra_words=(), cache_size=4096):
+        words = set()
+        for language_words in stop_words.values():
+            words.update(word.lower() for word in language_words)
+        words.update(word.lower() for word in extra_words)
+        self.stop_words = frozenset(words)
+        self.normalize = lru_cache(maxsize=cache_size)(self._normalize)
+
+    def _normalize(self, text):
+        text = PUNCT_RE.sub("", str(text).lower().replace("-", " "))
+        text = NOISE_RE.sub(" ", text)
+        return " ".join(word for word in text.split() if word not in self.stop_words)
+
+
+# auto filter and inline search
+search_normalizer = QueryNormalizer(STOP_WORDS)
+# spell check also drops language names before asking TMDB
+spell_normalizer = QueryNormalizer(STOP_WORDS, LANGUAGES)
@@ -0,0 +1,38 @@
+import asyncio
+
+
+class SingleFlight:
+    """Share one in-flight call among concurrent callers asking for the same key.
+
+    The first caller starts the call, everyone arriving before it finishes
+    awaits the same future and gets the same result (or exception). Nothing
+    is kept once the call is done, that is what the caches are for.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = {}
+        self.started = 0
+        self.saved = 0
+        FLIGHTS.append(self)
+
+    async def do(self, key, func, *args, **kwargs):
+        future = self.calls.get(key)
+        if future is None:
+            self.started += 1
+            future = self.calls[key] = asyncio.ensure_future(func(*args, **kwargs))
+            future.add_done_callback(lambda _: self.calls.pop(key, None))
+        else:
+            self.saved += 1
+        # shield, so a caller that gives up does not cancel the call for the others
+        return await asyncio.shield(future)
+
+    def stats(self):
+        return f"{self.name}: {self.started} calls, {self.saved} duplicates saved"
+
+
+FLIGHTS = []
+
+
+def singleflight_stats():
+    return "\n".join(flight.stats() for flight in FLIGHTS)
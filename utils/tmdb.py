@@ -1,7 +1,9 @@
 import os
+import asyncio
 import requests
 from urllib.parse import quote_plus
 from difflib import SequenceMatcher, get_close_matches
+from utils.singleflight import SingleFlight
 
 TMDB_API_KEY = os.getenv('TMDB_API_KEY')
 if not TMDB_API_KEY:
@@ -10,6 +12,8 @@ if not TMDB_API_KEY:
 API_BASE = 'https://api.themoviedb.org/3'
 POSTER_BASE = 'https://image.tmdb.org/t/p/w500'
 
+tmdb_flight = SingleFlight('TMDB lookups')
+
 
 def _get(path, params=None):
     if params is None:
@@ -20,6 +24,39 @@ def _get(path, params=None):
     return resp.json()
 
 
+async def _get_async(path, params=None):
+    # requests blocks, so TMDB calls run in a thread; identical calls in flight share one request
+    key = (path, tuple(sorted((params or {}).items())))
+    return await tmdb_flight.do(key, asyncio.get_event_loop().run_in_executor, None, _get, path, params)
+
+
+async def tmdb_search(query):
+    """Movie search results for a title, [] when TMDB can not be reached."""
+    try:
+        data = await _get_async('/search/movie', {'query': query})
+    except Exception:
+        return []
+    return data.get('results', [])
+
+
+async def tmdb_get_movie(movie_id):
+    """Movie details with credits and languages flattened to name lists, None when TMDB can not be reached."""
+    try:
+        data = await _get_async(f'/movie/{movie_id}', {'append_to_response': 'credits'})
+    except Exception:
+        return None
+    credits = data.get('credits') or {}
+    crew = credits.get('crew', [])
+    return {
+        **data,
+        'cast': [person['name'] for person in credits.get('cast', [])[:10]],
+        'director': [person['name'] for person in crew if person.get('job') == 'Director'],
+        'writer': [person['name'] for person in crew if person.get('department') == 'Writing'],
+        'producer': [person['name'] for person in crew if person.get('job') == 'Producer'],
+        'spoken_languages': [language.get('english_name') or language.get('name') for language in data.get('spoken_languages', [])],
+    }
+
+
 def normalize_movie(m):
     return {
         'type': 'movie',